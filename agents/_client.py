@@ -0,0 +1,24 @@
+import os
+
+import google.generativeai as genai
+from dotenv import load_dotenv
+
+# Load environment variables from .env
+load_dotenv()
+genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+
+DEFAULT_MODEL_NAME = "gemini-2.0-flash"
+
+_models = {}
+
+
+def get_model(model_name=DEFAULT_MODEL_NAME):
+    """
+    Process-wide GenerativeModel singletons — one underlying client per model
+    name instead of one per agent, so TLS/auth/session setup is paid once.
+    """
+    model = _models.get(model_name)
+    if model is None:
+        model = genai.GenerativeModel(model_name)
+        _models[model_name] = model
+    return model
@@ -36,62 +36,336 @@ from langchain.prompts import PromptTemplate
 from langchain_core.runnables import RunnableSequence
 from langchain_core.runnables.base import Runnable
 import google.generativeai as genai
+from google.api_core import exceptions as api_exceptions
+import asyncio
 import os
+import random
+import re
 import time
+from dataclasses import dataclass
 from dotenv import load_dotenv
 
+from agents._client import get_model
+from utility.feedback_logger import log_usage
+
 # Load environment variables from .env
 load_dotenv()
 
 GEMINI_API_KEY = os.getenv("GOOGLE_API_KEY")
 genai.configure(api_key=GEMINI_API_KEY)
 
+# Gemini rejects explicit caches below 4,096 tokens (~4 chars per token).
+MIN_CACHE_TOKENS = 4096
+_CHARS_PER_TOKEN = 4
+
+CACHED_DOCUMENT_NOTE = "(The full RFP document is provided in the cached context above.)"
+
+
+def create_document_cache(document, model_name="gemini-2.0-flash", ttl="10m"):
+    """
+    Upload the RFP text once as an explicit Gemini context cache so every agent
+    reuses it as a cached prefix instead of re-sending it in each prompt.
+    Returns None when the document is below Gemini's minimum cache size or the
+    cache call fails — callers then fall back to sending the document inline.
+    """
+    if len(document) < MIN_CACHE_TOKENS * _CHARS_PER_TOKEN:
+        return None
+    try:
+        return genai.caching.CachedContent.create(
+            model=f"models/{model_name}",
+            contents=[document],
+            ttl=ttl,
+        )
+    except Exception as e:
+        print(f"Context cache creation failed: {e}. Falling back to inline document.")
+        return None
+
+
+class CacheUnavailableError(Exception):
+    """The explicit context cache backing a model is gone (expired or deleted)."""
+
+
+def _is_cache_error(error):
+    """Requests against an expired/deleted CachedContent fail permanently."""
+    text = str(error)
+    if "CachedContent" in text or "cachedContents/" in text:
+        return True
+    lowered = text.lower()
+    return "cache" in lowered and ("not found" in lowered or "expired" in lowered)
+
+
+# Retry/backoff tuning: short randomized waits beat the old fixed 41 s floor,
+# and jitter keeps concurrent agents from retrying in lockstep after a 429.
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_CAP_SECONDS = 30.0
+
+
+_RETRYABLE_EXCEPTIONS = (
+    api_exceptions.ResourceExhausted,     # 429
+    api_exceptions.ServiceUnavailable,    # 503
+    api_exceptions.InternalServerError,   # 500
+    api_exceptions.DeadlineExceeded,      # 504
+)
+
+# Word-boundaried so a 400 like "exceeds 1048576 tokens, got 2500000" doesn't
+# read as a 500 and burn the whole retry budget on a permanent client error.
+_RETRYABLE_STATUS_RE = re.compile(r"\b(?:429|500|503|504)\b")
+
+
+def _is_retryable(error):
+    """Only rate limits (429) and transient server errors are worth retrying."""
+    if isinstance(error, _RETRYABLE_EXCEPTIONS):
+        return True
+    text = str(error)
+    lowered = text.lower()
+    if "quota" in lowered or "rate limit" in lowered:
+        return True
+    return bool(_RETRYABLE_STATUS_RE.search(text))
+
+
+def _parse_retry_delay(error):
+    """Extract the server-suggested retry_delay (seconds) from a 429, if present."""
+    match = re.search(r"retry_delay\s*{\s*seconds:\s*(\d+)", str(error))
+    if match:
+        return float(match.group(1))
+    return None
+
+
+def _backoff_seconds(error, attempt):
+    """Full-jitter exponential backoff, floored at the server's retry_delay."""
+    sleep = min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt) * (0.5 + random.random())
+    floor = _parse_retry_delay(error)
+    if floor is not None:
+        sleep = max(sleep, floor)
+    return sleep
+
+
+# Whether generation configs may carry service_tier. The installed SDK build
+# rejecting the field is permanent for the process, so the first TypeError
+# flips this off and later flex-tagged calls skip the field entirely instead
+# of rediscovering the exception each time.
+_SERVICE_TIER_SUPPORTED = True
+
+
+def _mark_service_tier_unsupported():
+    global _SERVICE_TIER_SUPPORTED
+    if _SERVICE_TIER_SUPPORTED:
+        _SERVICE_TIER_SUPPORTED = False
+        print("Flex service tier unsupported here; using the standard tier from now on.")
+
+
+@dataclass
+class GeminiResult:
+    """One Gemini call's text plus the usage metadata needed to measure caching ROI."""
+    text: str
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    output_tokens: int = 0
+    latency_ms: float = 0.0
+
+
 class GeminiAgent:
-    def __init__(self, model_name="gemini-2.0-flash"):
+    def __init__(self, model_name="gemini-2.0-flash", cached_content=None, model=None):
         self.model_name = model_name
-        self.gemini = genai.GenerativeModel(model_name)
+        if model is not None:
+            self.gemini = model
+        elif cached_content is not None:
+            self.gemini = genai.GenerativeModel.from_cached_content(cached_content)
+        else:
+            self.gemini = get_model(model_name)
+
+    def _extract_text(self, response):
+        if not response.candidates:
+            print("No candidates returned. Skipping chunk.")
+            return ""
+
+        if response.candidates[0].finish_reason == "RECITATION":
+            print("Chunk blocked due to recitation. Skipping.")
+            return ""
+
+        if hasattr(response, "text"):
+            return response.text.strip()
+        elif hasattr(response, "parts"):
+            return "".join([p.text for p in response.parts])
+        else:
+            return str(response)
 
-    def call_gemini(self, prompt, retries=5, delay=41, temperature=0):
+    def _build_result(self, response, started):
+        usage = getattr(response, "usage_metadata", None)
+        return GeminiResult(
+            text=self._extract_text(response),
+            prompt_tokens=getattr(usage, "prompt_token_count", 0) or 0,
+            cached_tokens=getattr(usage, "cached_content_token_count", 0) or 0,
+            output_tokens=getattr(usage, "candidates_token_count", 0) or 0,
+            latency_ms=(time.perf_counter() - started) * 1000,
+        )
+
+    def _generation_config(self, temperature, service_tier=None):
+        config = {"temperature": temperature}
+        if service_tier and _SERVICE_TIER_SUPPORTED:
+            config["service_tier"] = service_tier
+        return config
+
+    def call_gemini(self, prompt, retries=5, temperature=0, service_tier=None):
+        config = self._generation_config(temperature, service_tier)
+        started = time.perf_counter()
         for attempt in range(retries):
             try:
-                response = self.gemini.generate_content(prompt, generation_config={"temperature": temperature})
+                response = self.gemini.generate_content(prompt, generation_config=config)
+                return self._build_result(response, started)
+
+            except Exception as e:
+                if _is_cache_error(e):
+                    # Let the wrapper re-send with the document inline instead
+                    # of returning a silent blank result.
+                    raise CacheUnavailableError(str(e)) from e
+                if "service_tier" in config and ("service_tier" in str(e) or "Sheddable" in str(e)):
+                    # Shed requests are transient; a rejected field means the
+                    # SDK has no flex support at all, so remember that.
+                    if "Sheddable" in str(e):
+                        print("Flex request shed; retrying on standard tier.")
+                    else:
+                        _mark_service_tier_unsupported()
+                    config = self._generation_config(temperature)
+                    continue
+                if "requires the response to contain a valid `Part`" in str(e) or "finish_reason" in str(e):
+                    print("Chunk blocked by Gemini (recitation/copyright). Skipping.")
+                    return GeminiResult("")
+                elif not _is_retryable(e):
+                    print(f"Gemini API client error (not retrying): {e}")
+                    return GeminiResult("")
+                else:
+                    delay = _backoff_seconds(e, attempt)
+                    print(f"Gemini API call error: {e}. Retrying in {delay:.1f} seconds (Attempt {attempt + 1}/{retries})...")
+                    time.sleep(delay)
 
-                if not response.candidates:
-                    print("No candidates returned. Skipping chunk.")
-                    return ""
+        print("All retries failed. Skipping this chunk.")
+        return GeminiResult("")
 
-                if response.candidates[0].finish_reason == "RECITATION":
-                    print("Chunk blocked due to recitation. Skipping.")
-                    return ""
+    def call_gemini_stream(self, prompt, temperature=0):
+        """Yield response text incrementally so the UI can render tokens as they arrive."""
+        try:
+            response = self.gemini.generate_content(
+                prompt, generation_config={"temperature": temperature}, stream=True
+            )
+            for chunk in response:
+                try:
+                    if chunk.text:
+                        yield chunk.text
+                except ValueError:
+                    # Chunks without a valid Part (safety/recitation) carry no text.
+                    continue
+        except Exception as e:
+            if _is_cache_error(e):
+                raise CacheUnavailableError(str(e)) from e
+            if "requires the response to contain a valid `Part`" in str(e) or "finish_reason" in str(e):
+                print("Chunk blocked by Gemini (recitation/copyright). Skipping.")
+            else:
+                print(f"Gemini API streaming error: {e}")
+                yield f"Error: {e}"
 
-                if hasattr(response, "text"):
-                    return response.text.strip()
-                elif hasattr(response, "parts"):
-                    return "".join([p.text for p in response.parts])
-                else:
-                    return str(response)
+    async def call_gemini_async(self, prompt, retries=5, temperature=0, service_tier=None):
+        config = self._generation_config(temperature, service_tier)
+        started = time.perf_counter()
+        for attempt in range(retries):
+            try:
+                response = await self.gemini.generate_content_async(prompt, generation_config=config)
+                return self._build_result(response, started)
 
             except Exception as e:
+                if _is_cache_error(e):
+                    raise CacheUnavailableError(str(e)) from e
+                if "service_tier" in config and ("service_tier" in str(e) or "Sheddable" in str(e)):
+                    if "Sheddable" in str(e):
+                        print("Flex request shed; retrying on standard tier.")
+                    else:
+                        _mark_service_tier_unsupported()
+                    config = self._generation_config(temperature)
+                    continue
                 if "requires the response to contain a valid `Part`" in str(e) or "finish_reason" in str(e):
                     print("Chunk blocked by Gemini (recitation/copyright). Skipping.")
-                    return ""
+                    return GeminiResult("")
+                elif not _is_retryable(e):
+                    print(f"Gemini API client error (not retrying): {e}")
+                    return GeminiResult("")
                 else:
-                    print(f"Gemini API call error: {e}. Retrying in {delay} seconds (Attempt {attempt + 1}/{retries})...")
-                    time.sleep(delay)
-                    delay *= 2
+                    delay = _backoff_seconds(e, attempt)
+                    print(f"Gemini API call error: {e}. Retrying in {delay:.1f} seconds (Attempt {attempt + 1}/{retries})...")
+                    await asyncio.sleep(delay)
 
         print("All retries failed. Skipping this chunk.")
-        return ""
+        return GeminiResult("")
+
 
-def create_agent(prompt_template: PromptTemplate, temperature=0):
+# One shared client for all agents — model construction (auth, HTTP session)
+# is paid once instead of once per create_agent call.
+_shared_gemini_agent = GeminiAgent()
+
+
+def create_agent(prompt_template: PromptTemplate, temperature=0, tier=None, name=""):
     """
     Create a callable agent that formats the prompt and calls Gemini.
+    When the input carries a "cached_content" handle, the RFP body lives in the
+    Gemini context cache and only the instruction portion of the prompt is sent.
+    tier="flex" marks non-interactive agents for the discounted service tier
+    (falls back to standard when the tier is unavailable).
     """
-    gemini_agent = GeminiAgent()
+    gemini_agent = _shared_gemini_agent
+    cached_agents = {}  # cache name -> GeminiAgent bound to that cached content
 
     class GeminiLangChainAgent:
+        def _prepare(self, input_data, use_cache=True):
+            input_data = dict(input_data)
+            cached_content = input_data.pop("cached_content", None)
+            if cached_content is not None and use_cache:
+                input_data["document"] = CACHED_DOCUMENT_NOTE
+                agent = cached_agents.get(cached_content.name)
+                if agent is None:
+                    agent = GeminiAgent(cached_content=cached_content)
+                    cached_agents[cached_content.name] = agent
+                return agent, prompt_template.format(**input_data), cached_content.name
+            return gemini_agent, prompt_template.format(**input_data), None
+
+        def _fallback_inline(self, input_data, cache_name, error):
+            """Drop the dead cache handle and rebuild the prompt with the document inline."""
+            print(f"Context cache unavailable ({error}); retrying with the document inline.")
+            cached_agents.pop(cache_name, None)
+            agent, prompt, _ = self._prepare(input_data, use_cache=False)
+            return agent, prompt
+
         def invoke(self, input_data):
-            prompt = prompt_template.format(**input_data)
-            return {"text": gemini_agent.call_gemini(prompt, temperature=temperature)}
+            agent, prompt, cache_name = self._prepare(input_data)
+            try:
+                result = agent.call_gemini(prompt, temperature=temperature, service_tier=tier)
+            except CacheUnavailableError as e:
+                agent, prompt = self._fallback_inline(input_data, cache_name, e)
+                result = agent.call_gemini(prompt, temperature=temperature, service_tier=tier)
+            log_usage(name, result)
+            return {"text": result.text}
+
+        async def ainvoke(self, input_data):
+            agent, prompt, cache_name = self._prepare(input_data)
+            try:
+                result = await agent.call_gemini_async(prompt, temperature=temperature, service_tier=tier)
+            except CacheUnavailableError as e:
+                agent, prompt = self._fallback_inline(input_data, cache_name, e)
+                result = await agent.call_gemini_async(prompt, temperature=temperature, service_tier=tier)
+            log_usage(name, result)
+            return {"text": result.text}
+
+        def stream(self, input_data):
+            agent, prompt, cache_name = self._prepare(input_data)
+
+            def _gen():
+                try:
+                    yield from agent.call_gemini_stream(prompt, temperature=temperature)
+                except CacheUnavailableError as e:
+                    fb_agent, fb_prompt = self._fallback_inline(input_data, cache_name, e)
+                    yield from fb_agent.call_gemini_stream(fb_prompt, temperature=temperature)
+
+            return _gen()
 
-    return GeminiLangChainAgent()
+    agent_instance = GeminiLangChainAgent()
+    # Exposed so callers can build response-cache keys that invalidate on template edits.
+    agent_instance.template_src = prompt_template.template
+    return agent_instance
@@ -7,4 +7,4 @@ template = PromptTemplate(
 of all submission requirements, including document format (e.g., page limits, font type/size, line spacing),
 required attachments or forms, table of contents requirements, and any other specific instructions.:\n\n{document}"""
 )
-agent = create_agent(template)
+agent = create_agent(template, tier="flex", name="checklist")  # latency-tolerant: discounted service tier
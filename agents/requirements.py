@@ -18,4 +18,4 @@ template = PromptTemplate(
     ]
 :\n\n{document}"""
 )
-agent = create_agent(template)
+agent = create_agent(template, tier="flex", name="requirements")  # latency-tolerant: discounted service tier
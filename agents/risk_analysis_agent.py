@@ -17,4 +17,4 @@ For each risk found, provide:
 
 Use bullet points. No extra commentary.:\n\n{document}"""
 )
-agent = create_agent(template)
+agent = create_agent(template, name="risk_analysis")
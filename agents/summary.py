@@ -8,4 +8,4 @@ template = PromptTemplate(
 - Identify key objectives and any critical deadlines or instructions.
 - Do not exceed 250 words.:\n\n{document}"""
 )
-agent = create_agent(template)
+agent = create_agent(template, tier="flex", name="summary")  # latency-tolerant: discounted service tier
@@ -8,20 +8,20 @@ company_data = load_json("json/company_data.json")
 company_data_str = json.dumps(company_data, indent=2)
 escaped_company_json = company_data_str.replace("{", "{{").replace("}", "}}")
 
-# Prompt template with natural explanation and math
+# Prompt template with natural explanation and math.
+# All static content (role, company profile, task, output schema) comes first
+# and the variable {document} is strictly last, so Gemini's implicit prefix
+# cache keeps matching across different uploaded RFPs.
 template = PromptTemplate(
     input_variables=["document"],
     template=f"""
 You are an expert in government RFP eligibility evaluation. You will receive two inputs:
 
-1. The full RFP content (unstructured text)  
-2. The company profile (already embedded below)
+1. The company profile (already embedded below)
+2. The full RFP content (unstructured text, at the end)
 
 ---
 
-### RFP Document:
-{{document}}
-
 ### Company Profile:
 {escaped_company_json}
 
@@ -54,10 +54,15 @@ You are an expert in government RFP eligibility evaluation. You will receive two
   "met_optional": [...],
   "missing_mandatory": [...]
 }}}}
+
+---
+
+### RFP Document:
+{{document}}
 """
 )
 
-agent = create_agent(template)
+agent = create_agent(template, name="verdict")
 
 
 
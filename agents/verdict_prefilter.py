@@ -0,0 +1,107 @@
+import json
+import re
+
+from utility.fileparser import load_json
+
+# Cheap deterministic pre-checks that run before the expensive verdict agent.
+# The fastest LLM call is the one you don't make: if a hard rule already
+# disqualifies the company, return the verdict JSON directly with zero tokens.
+
+company_data = load_json("json/company_data.json")
+
+_company = company_data.get("Company", {})
+
+_STATE_NAMES = {
+    "alabama", "alaska", "arizona", "arkansas", "california", "colorado",
+    "connecticut", "delaware", "florida", "georgia", "hawaii", "idaho",
+    "illinois", "indiana", "iowa", "kansas", "kentucky", "louisiana", "maine",
+    "maryland", "massachusetts", "michigan", "minnesota", "mississippi",
+    "missouri", "montana", "nebraska", "nevada", "new hampshire", "new jersey",
+    "new mexico", "new york", "north carolina", "north dakota", "ohio",
+    "oklahoma", "oregon", "pennsylvania", "rhode island", "south carolina",
+    "south dakota", "tennessee", "texas", "utah", "vermont", "virginia",
+    "washington", "west virginia", "wisconsin", "wyoming",
+}
+
+_STATE_ABBREVS = {
+    "AL": "alabama", "AK": "alaska", "AZ": "arizona", "AR": "arkansas",
+    "CA": "california", "CO": "colorado", "CT": "connecticut",
+    "DE": "delaware", "FL": "florida", "GA": "georgia", "HI": "hawaii",
+    "ID": "idaho", "IL": "illinois", "IN": "indiana", "IA": "iowa",
+    "KS": "kansas", "KY": "kentucky", "LA": "louisiana", "ME": "maine",
+    "MD": "maryland", "MA": "massachusetts", "MI": "michigan",
+    "MN": "minnesota", "MS": "mississippi", "MO": "missouri",
+    "MT": "montana", "NE": "nebraska", "NV": "nevada", "NH": "new hampshire",
+    "NJ": "new jersey", "NM": "new mexico", "NY": "new york",
+    "NC": "north carolina", "ND": "north dakota", "OH": "ohio",
+    "OK": "oklahoma", "OR": "oregon", "PA": "pennsylvania",
+    "RI": "rhode island", "SC": "south carolina", "SD": "south dakota",
+    "TN": "tennessee", "TX": "texas", "UT": "utah", "VT": "vermont",
+    "VA": "virginia", "WA": "washington", "WV": "west virginia",
+    "WI": "wisconsin", "WY": "wyoming",
+}
+
+# Only incorporation is treated as incurable here: "registered/licensed to do
+# business in X" can be obtained by an out-of-state company before award, so
+# those clauses go to the verdict agent instead of short-circuiting.
+_STATE_REQUIREMENT_RE = re.compile(
+    r"must be incorporated in (?:the [Ss]tate of )?([A-Z][a-z]+(?: [A-Z][a-z]+)?)"
+)
+
+
+def _company_states():
+    """States the company plausibly operates/is registered in."""
+    states = set()
+    incorporation = _company.get("StateOfIncorporation", "")
+    if incorporation:
+        states.add(incorporation.strip().lower())
+    address = _company.get("PrincipalBusinessAddress", "")
+    for token in re.split(r"[,\s]+", address):
+        token = token.strip()
+        if token.lower() in _STATE_NAMES:
+            states.add(token.lower())
+        # Two-letter abbreviations (e.g. "Dallas, TX 75201"); uppercase-only so
+        # ordinary words like "in" or "or" never match their abbreviation.
+        elif token.isupper() and token in _STATE_ABBREVS:
+            states.add(_STATE_ABBREVS[token])
+    return states
+
+
+def _disqualified(reason, requirement):
+    return {
+        "eligible": False,
+        "verdict": "Not Eligible",
+        "reasoning": reason,
+        "mandatory_requirements": [requirement],
+        "optional_requirements": [],
+        "met_mandatory": [],
+        "met_optional": [],
+        "missing_mandatory": [requirement],
+    }
+
+
+def prefilter_verdict(document):
+    """
+    Return a verdict dict when the RFP is trivially decidable from hard rules,
+    or None when the full verdict agent is actually needed.
+    """
+    match = _STATE_REQUIREMENT_RE.search(document)
+    if match:
+        required_state = match.group(1).strip().lower()
+        if required_state in _STATE_NAMES and required_state not in _company_states():
+            requirement = f"Incorporated in {match.group(1)}"
+            return _disqualified(
+                f"RFP requires incorporation in {match.group(1)}, but the company "
+                f"is incorporated in {_company.get('StateOfIncorporation', 'another state')}.",
+                requirement,
+            )
+
+    return None
+
+
+def prefilter_verdict_text(document):
+    """Prefilter result rendered as the same JSON string the verdict agent emits."""
+    result = prefilter_verdict(document)
+    if result is None:
+        return None
+    return json.dumps(result, indent=2)
@@ -1,19 +1,50 @@
+import asyncio
+import io
+import json
 import streamlit as st
-from pathlib import Path
 from openai import RateLimitError
 
 
-from utility.fileparser import parse_file, load_json
-from utility.chunker import chunk_text
-from utility.feedback_logger import log_feedback  # New
+from utility.fileparser import parse_file
+from utility.feedback_logger import log_feedback, usage_stats  # New
+from utility.batch_runner import run_batch
+from utility import response_cache
+from utility.map_reduce import condense_document
 
 from agents import checklist, requirements, risk_analysis_agent, summary, verdict
+from agents.base_agent import create_document_cache
+from agents.verdict import company_data
+from agents.verdict_prefilter import prefilter_verdict_text
 from chatbot import main as chatbot_main_raw
 from generate_doc_ui import get_rag_content, list_processed_documents, answer_question
 from document_generated import generate_proposal_document
 # Setup
 st.set_page_config(page_title="RFP Assistant", layout="wide")
-company_data = load_json("json/company_data.json")
+
+
+@st.cache_data(show_spinner=False)
+def _load_rfp(file_bytes: bytes, file_name: str) -> str:
+    """Parse an uploaded RFP once per (content, name); reruns hit the cache."""
+    # Parse straight from memory — no temp_*.pdf write or cleanup needed.
+    return parse_file(io.BytesIO(file_bytes), file_name=file_name)
+
+
+@st.cache_data(show_spinner=False)
+def _condensed(full_doc: str) -> str:
+    """Map-reduce condensed version of long RFPs for the non-critical agents."""
+    return condense_document(full_doc)
+
+
+def _condensable_doc(full_doc: str) -> str:
+    """Document to hand the non-critical agents: condensed only when no cache.
+
+    With a live context cache the agent reads the full document from the
+    cached prefix and ignores the inline text, so condensing would spend
+    flash-lite calls on a result that gets discarded.
+    """
+    if st.session_state.get("rfp_cache") is not None:
+        return full_doc
+    return _condensed(full_doc)
 
 # Initialize session state for tab
 if "active_tab" not in st.session_state:
@@ -46,6 +77,17 @@ with st.sidebar:
             ])
         else:
             st.info("Upload a PDF to enable analysis tools.")
+        with st.expander("📈 Cache stats"):
+            totals = usage_stats()
+            if totals["prompt_tokens"]:
+                hit_rate = totals["cached_tokens"] / totals["prompt_tokens"]
+                st.metric("Cache hit rate", f"{hit_rate:.0%}")
+                st.caption(
+                    f"{totals['calls']} calls · {totals['cached_tokens']:,} cached "
+                    f"/ {totals['prompt_tokens']:,} prompt tokens"
+                )
+            else:
+                st.caption("No Gemini calls logged yet this session.")
     elif st.session_state.active_tab == "Chatbot":
         st.markdown("### 💬 Chatbot Tools")
         st.markdown("Use natural language to chat with the uploaded RFP.")
@@ -53,31 +95,46 @@ with st.sidebar:
 # ---------------- Main Area ----------------
 if st.session_state.active_tab == "Analyzer":
     st.title("⚡ Fast RFP Analyzer")
-    chunks = []
 
     if "analyzer_file" in st.session_state and st.session_state.analyzer_file:
         uploaded_file = st.session_state.analyzer_file
-        temp_path = Path(f"temp_{uploaded_file.name}")
-        with open(temp_path, "wb") as f:
-            f.write(uploaded_file.read())
-
-        rfp_text = parse_file(temp_path)
-        chunks = chunk_text(rfp_text)
-
-        def run_agent_single(agent, chunks, extra_inputs=None):
+        # Parse once and share the text everywhere — the analyzer path no longer
+        # chunks at all (chunking is only needed for vector-store ingestion).
+        full_doc = _load_rfp(uploaded_file.getvalue(), uploaded_file.name)
+        st.session_state["rfp_text"] = full_doc
+
+        # Upload the RFP once as an explicit Gemini context cache so all five
+        # agents share the same cached prefix instead of re-sending the document.
+        if st.session_state.get("rfp_cache_file") != uploaded_file.name:
+            st.session_state["rfp_cache"] = create_document_cache(full_doc)
+            st.session_state["rfp_cache_file"] = uploaded_file.name
+
+        def run_agent_single(agent, full_doc, extra_inputs=None, agent_id=""):
             """Run the agent on the full document instead of per-chunk to avoid multiple outputs."""
-            full_doc = "\n\n".join(chunks)
+            # Client-side response cache: re-running the same agent on the same
+            # RFP (and same template version) returns instantly with zero tokens.
+            extra_key = json.dumps(extra_inputs, default=str, sort_keys=True) if extra_inputs else ""
+            cache_key = response_cache.make_key(
+                agent_id, getattr(agent, "template_src", ""), full_doc, extra_key
+            )
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                return cached
             input_payload = {"document": full_doc}
+            if st.session_state.get("rfp_cache") is not None:
+                input_payload["cached_content"] = st.session_state["rfp_cache"]
             if extra_inputs:
                 input_payload.update(extra_inputs)
             try:
                 output = agent.invoke(input_payload)
                 if hasattr(output, "content"):
-                    return output.content
+                    result = output.content
                 elif isinstance(output, dict) and "text" in output:
-                    return output["text"]
+                    result = output["text"]
                 else:
-                    return str(output)
+                    result = str(output)
+                response_cache.set(cache_key, result)
+                return result
             except RateLimitError:
                 st.error("🛑 Rate limit hit. Try again later.")
                 return "Rate limit error."
@@ -86,34 +143,139 @@ if st.session_state.active_tab == "Analyzer":
                 return str(e)
 
 
+        def run_agent_stream(agent, full_doc, extra_inputs=None, agent_id=""):
+            """Stream the agent's output incrementally; repeat runs come straight from the response cache."""
+            extra_key = json.dumps(extra_inputs, default=str, sort_keys=True) if extra_inputs else ""
+            cache_key = response_cache.make_key(
+                agent_id, getattr(agent, "template_src", ""), full_doc, extra_key
+            )
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                return iter([cached])
+            input_payload = {"document": full_doc}
+            if st.session_state.get("rfp_cache") is not None:
+                input_payload["cached_content"] = st.session_state["rfp_cache"]
+            if extra_inputs:
+                input_payload.update(extra_inputs)
+
+            def _gen():
+                parts = []
+                try:
+                    for piece in agent.stream(input_payload):
+                        parts.append(piece)
+                        yield piece
+                except RateLimitError:
+                    st.error("🛑 Rate limit hit. Try again later.")
+                    yield "Rate limit error."
+                    return
+                except Exception as e:
+                    st.error(f"Error running agent: {e}")
+                    yield str(e)
+                    return
+                response_cache.set(cache_key, "".join(parts))
+
+            return _gen()
+
+        async def run_all_agents(full_doc):
+            """Run all five agents concurrently — wall time ≈ the slowest call instead of the sum."""
+            payload = {"document": full_doc}
+            if st.session_state.get("rfp_cache") is not None:
+                payload["cached_content"] = st.session_state["rfp_cache"]
+            agent_specs = [
+                ("📌 Eligibility Verdict", verdict.agent, payload),
+                ("📋 Legal Terms Checklist", checklist.agent, payload),
+                ("📤 Submission Requirements", requirements.agent, payload),
+                ("📝 Summary", summary.agent, payload),
+                ("⚠️ Risk Analysis", risk_analysis_agent.agent, {**payload, "company_data": company_data}),
+            ]
+            outputs = await asyncio.gather(
+                *(agent.ainvoke(inputs) for _, agent, inputs in agent_specs),
+                return_exceptions=True,
+            )
+            results = {}
+            for (name, _, _), output in zip(agent_specs, outputs):
+                if isinstance(output, Exception):
+                    results[name] = f"Error running agent: {output}"
+                elif isinstance(output, dict) and "text" in output:
+                    results[name] = output["text"]
+                else:
+                    results[name] = str(output)
+            return results
+
+        if st.button("🚀 Analyze All (runs the 5 agents concurrently)"):
+            with st.spinner("Running all agents..."):
+                all_results = asyncio.run(run_all_agents(full_doc))
+            st.success("✅ Done!")
+            for name, text in all_results.items():
+                st.subheader(name)
+                st.write(text)
+
+        if st.button("🧾 Generate full report (batch, cheaper)"):
+            # Route the three non-interactive analyzers through the Batch API
+            # (50% discount); only verdict and risk analysis stay synchronous.
+            batch_prompts = {
+                "📝 Summary": summary.template.format(document=_condensed(full_doc)),
+                "📋 Legal Terms Checklist": checklist.template.format(document=_condensed(full_doc)),
+                "📤 Submission Requirements": requirements.template.format(document=full_doc),
+            }
+            with st.spinner("Batch job submitted — this can take a few minutes..."):
+                try:
+                    report_results = run_batch(batch_prompts)
+                except Exception as e:
+                    st.error(f"Batch job failed: {e}")
+                    report_results = {}
+            with st.spinner("Running verdict and risk analysis..."):
+                report_results["📌 Eligibility Verdict"] = (
+                    prefilter_verdict_text(full_doc)
+                    or run_agent_single(verdict.agent, full_doc, agent_id="verdict")
+                )
+                report_results["⚠️ Risk Analysis"] = run_agent_single(
+                    risk_analysis_agent.agent,
+                    full_doc,
+                    extra_inputs={"company_data": company_data},
+                    agent_id="risk_analysis"
+                )
+            st.success("✅ Done!")
+            for name, text in report_results.items():
+                st.subheader(name)
+                st.write(text)
+
         if run_type:
             st.subheader(run_type)
             with st.spinner("Running agent..."):
                 if run_type == "📌 Eligibility Verdict":
-                    result = run_agent_single(verdict.agent, chunks)
+                    # Deterministic rules first — only ambiguous cases pay for the LLM.
+                    prefiltered = prefilter_verdict_text(full_doc)
+                    if prefiltered is not None:
+                        stream = iter([prefiltered])
+                    else:
+                        stream = run_agent_stream(verdict.agent, full_doc, agent_id="verdict")
                 #     result = verdict.agent.invoke({
                 #     "document": chunk,
                 #     "aggregated_json": json.dumps(aggregated_json)
                 # })
                 elif run_type == "📋 Legal Terms Checklist":
-                    result = run_agent_single(checklist.agent, chunks)
+                    stream = run_agent_stream(checklist.agent, _condensable_doc(full_doc), agent_id="checklist")
 
                 elif run_type == "📤 Submission Requirements":
-                    result = run_agent_single(requirements.agent, chunks)
+                    stream = run_agent_stream(requirements.agent, full_doc, agent_id="requirements")
 
                 elif run_type == "📝 Summary":
-                    result = run_agent_single(summary.agent, chunks)
+                    stream = run_agent_stream(summary.agent, _condensable_doc(full_doc), agent_id="summary")
 
                 elif run_type == "⚠️ Risk Analysis":
-                    result = run_agent_single(
+                    stream = run_agent_stream(
                         risk_analysis_agent.agent,
-                        chunks,
-                        extra_inputs={"company_data": company_data}
+                        full_doc,
+                        extra_inputs={"company_data": company_data},
+                        agent_id="risk_analysis"
                     )
                 else:
-                    result = "Invalid selection"
+                    stream = iter(["Invalid selection"])
+                # Render tokens as they arrive; returns the accumulated text for
+                # the feedback logger below.
+                result = st.write_stream(stream)
             st.success("✅ Done!")
-            st.write(result)
 
             # Feedback Section
             st.markdown("#### 🙋 Was this helpful?")
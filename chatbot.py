@@ -3,11 +3,15 @@ from PyPDF2 import PdfReader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_google_genai import GoogleGenerativeAIEmbeddings, ChatGoogleGenerativeAI
 from langchain.vectorstores import FAISS
+from langchain.docstore.in_memory import InMemoryDocstore
+from langchain.schema import Document
 from langchain.chains.question_answering import load_qa_chain
+import faiss
 from langchain.prompts import PromptTemplate
 from dotenv import load_dotenv
 import google.generativeai as genai
 import os
+import sqlite3
 import uuid
 import json
 
@@ -18,17 +22,64 @@ genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
 # ======================== PDF & Text Functions ========================
 def get_pdf_text(pdf_docs):
     """Extracts and concatenates text from a list of uploaded PDFs."""
-    text = ""
+    # Accumulate page texts and join once — += on a string is O(N²) for big PDFs.
+    parts = []
     for pdf in pdf_docs:
         pdf_reader = PdfReader(pdf)
         for page in pdf_reader.pages:
-            text += page.extract_text() or ""
-    return text
+            t = page.extract_text()
+            if t:
+                parts.append(t)
+    return "".join(parts)
 
 def get_text_chunks(text):
     """Splits long text into smaller overlapping chunks."""
-    text_splitter = RecursiveCharacterTextSplitter(chunk_size=10000, chunk_overlap=1000)
-    return text_splitter.split_text(text)
+    # 200-char overlap instead of 1000: the old 10% duplication inflated both
+    # embedding cost and index size; retrieval top-k covers chunk boundaries.
+    text_splitter = RecursiveCharacterTextSplitter(chunk_size=10000, chunk_overlap=200)
+    chunks = text_splitter.split_text(text)
+    # Drop exact duplicates (repeated headers/footers) while preserving order.
+    seen = set()
+    unique_chunks = []
+    for chunk in chunks:
+        if chunk not in seen:
+            seen.add(chunk)
+            unique_chunks.append(chunk)
+    return unique_chunks
+
+# ======================== Cached Clients ========================
+@st.cache_resource
+def _get_embeddings():
+    """One embeddings client per process — avoids re-auth and session setup per call."""
+    return GoogleGenerativeAIEmbeddings(model="models/embedding-001")
+
+# The embedding API caps one request at 100 items; 64 matches generate_doc_ui.
+EMBED_BATCH_SIZE = 64
+
+
+def _embed_in_batches(text_chunks):
+    """Embed chunks in capped batches — a handful of round-trips, never one per chunk."""
+    vectors = []
+    for start in range(0, len(text_chunks), EMBED_BATCH_SIZE):
+        result = genai.embed_content(
+            model="models/embedding-001",
+            content=text_chunks[start:start + EMBED_BATCH_SIZE],
+            task_type="RETRIEVAL_DOCUMENT",
+        )
+        vectors.extend(result["embedding"])
+    return vectors
+
+REGISTRY_DB = os.path.join("faiss_index", "registry.sqlite")
+
+
+def _registry_connect():
+    """Open (and lazily initialize) the single SQLite registry of processed docs."""
+    os.makedirs("faiss_index", exist_ok=True)
+    conn = sqlite3.connect(REGISTRY_DB)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS docs (folder_id TEXT PRIMARY KEY, doc_name TEXT, created_at TEXT)"
+    )
+    return conn
 
 # ======================== Vector Store Functions ========================
 def save_vector_store(text_chunks, doc_name):
@@ -37,24 +88,67 @@ def save_vector_store(text_chunks, doc_name):
     folder_path = os.path.join("faiss_index", folder_id)
     os.makedirs(folder_path, exist_ok=True)
 
-    embeddings = GoogleGenerativeAIEmbeddings(model="models/embedding-001")
-    vector_store = FAISS.from_texts(text_chunks, embedding=embeddings)
+    embeddings = _get_embeddings()
+    vectors = _embed_in_batches(text_chunks)
+    vector_store = FAISS.from_embeddings(list(zip(text_chunks, vectors)), embeddings)
     vector_store.save_local(folder_path)
 
+    # Persist the docstore as plain JSONL alongside the native index so loads
+    # can mmap index.faiss and skip pickle deserialization entirely.
+    with open(os.path.join(folder_path, "docstore.jsonl"), "w") as f:
+        for i in range(vector_store.index.ntotal):
+            doc_id = vector_store.index_to_docstore_id[i]
+            doc = vector_store.docstore.search(doc_id)
+            f.write(json.dumps({"id": doc_id, "text": doc.page_content}) + "\n")
+
     metadata = {"doc_name": doc_name, "folder": folder_id}
     with open(os.path.join(folder_path, "metadata.json"), "w") as f:
         json.dump(metadata, f)
 
+    conn = _registry_connect()
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO docs VALUES (?, ?, datetime('now'))",
+            (folder_id, doc_name),
+        )
+    conn.close()
+
     return folder_id
 
 @st.cache_resource
 def load_vector_store(folder_name):
     """Loads vector store with Streamlit resource caching."""
-    embeddings = GoogleGenerativeAIEmbeddings(model="models/embedding-001")
-    return FAISS.load_local(os.path.join("faiss_index", folder_name), embeddings, allow_dangerous_deserialization=True)
+    embeddings = _get_embeddings()
+    folder_path = os.path.join("faiss_index", folder_name)
+    docstore_path = os.path.join(folder_path, "docstore.jsonl")
+    if os.path.exists(docstore_path):
+        try:
+            # Memory-map the native FAISS file and rebuild the docstore from
+            # JSONL — no pickle involved, and the OS page cache is shared.
+            index = faiss.read_index(
+                os.path.join(folder_path, "index.faiss"),
+                faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY,
+            )
+            docstore = {}
+            index_to_id = {}
+            with open(docstore_path) as f:
+                for i, line in enumerate(f):
+                    entry = json.loads(line)
+                    docstore[entry["id"]] = Document(page_content=entry["text"])
+                    index_to_id[i] = entry["id"]
+            return FAISS(
+                embedding_function=embeddings,
+                index=index,
+                docstore=InMemoryDocstore(docstore),
+                index_to_docstore_id=index_to_id,
+            )
+        except Exception as e:
+            print(f"mmap load failed ({e}); falling back to pickle load.")
+    # Legacy folders saved before docstore.jsonl existed.
+    return FAISS.load_local(folder_path, embeddings, allow_dangerous_deserialization=True)
 
-def list_processed_documents():
-    """Lists available processed documents with their metadata."""
+def _scan_legacy_documents():
+    """Per-folder metadata.json scan, kept for stores saved before the registry existed."""
     base_path = "faiss_index"
     if not os.path.exists(base_path):
         return []
@@ -68,9 +162,44 @@ def list_processed_documents():
                 docs.append((metadata["doc_name"], name))
     return docs
 
+
+# generate_doc_ui.py records its saves in a JSON index over the same
+# faiss_index/ directory; the listing merges both registries.
+_DOC_INDEX_PATH = os.path.join("faiss_index", "_index.json")
+
+
+def _doc_index_documents():
+    """(doc_name, folder_id) pairs from generate_doc_ui's JSON index, if present."""
+    try:
+        with open(_DOC_INDEX_PATH, "r") as f:
+            index = json.load(f)
+        return [(doc_name, folder_id) for folder_id, doc_name in index.items()]
+    except (OSError, ValueError):
+        return []
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def list_processed_documents():
+    """Lists processed documents from the registries — two reads instead of O(N) file opens."""
+    docs = []
+    seen = set()
+    if os.path.exists(REGISTRY_DB):
+        conn = _registry_connect()
+        rows = conn.execute(
+            "SELECT doc_name, folder_id FROM docs ORDER BY created_at DESC"
+        ).fetchall()
+        conn.close()
+        docs = [(doc_name, folder_id) for doc_name, folder_id in rows]
+        seen = {folder_id for _, folder_id in docs}
+    docs += [(d, f) for d, f in _doc_index_documents() if f not in seen]
+    if docs:
+        return docs
+    return _scan_legacy_documents()
+
 # ======================== QA Chain Setup ========================
+@st.cache_resource
 def get_conversational_chain():
-    """Initializes the prompt + LLM chain for QA."""
+    """Initializes the prompt + LLM chain for QA (built once per process)."""
     prompt_template = """
     Answer the question as detailed as possible from the provided context. If the answer is not in
     the provided context, just say "Answer is not available in the context." Do not make up answers.
@@ -117,6 +246,7 @@ def main():
                     chunks = get_text_chunks(text)
                     name = os.path.splitext(pdf_docs[0].name)[0].replace(" ", "_")
                     save_vector_store(chunks, name)
+                    list_processed_documents.clear()
                     st.success(f"'{name}' processed and saved!")
                     st.rerun()  # Trigger rerun to update dropdown
 
@@ -1,97 +1,136 @@
 import os
 import csv
-import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import lru_cache
 from docx import Document
-from docx.shared import Pt, Inches, RGBColor
+from docx.shared import Pt, RGBColor
 from docx.enum.text import WD_PARAGRAPH_ALIGNMENT, WD_LINE_SPACING
-from docx.enum.style import WD_STYLE_TYPE
-from docx.oxml.ns import qn
-from docx.oxml import OxmlElement
+from docx.oxml.ns import nsdecls
+from docx.oxml import parse_xml
+from io import BytesIO
+
+try:
+    from docxtpl import DocxTemplate
+except ImportError:
+    # Optional: when docxtpl (or the template file) is missing, the procedural
+    # add_* builders below remain the generation path.
+    DocxTemplate = None
+
+# Pre-authored Word template with {{ ... }} placeholders; when present, one
+# render call replaces the whole procedural build.
+PROPOSAL_TEMPLATE_PATH = "proposal_template.docx"
 
 # Remove direct import from app.py to avoid circular imports
 # Instead, we'll use function parameters to pass RAG functionality
 
+class _CompanyData(dict):
+    """
+    Flat company-data mapping plus groupings classified once during the CSV
+    pass, so builders don't re-scan every key per document. The lru_cache
+    shares one instance across calls — treat it as read-only.
+    """
+    __slots__ = ('key_personnel',)
+
+
+def _normalize_personnel_role(key):
+    """Strip the 'Key Personnel – ' prefix (including its mojibake variant)."""
+    return key.replace('Key Personnel â€" ', '').replace('Key Personnel – ', '')
+
+
+@lru_cache(maxsize=4)
+def _load_company_data_cached(csv_path, mtime):
+    # newline='' per the csv docs (the reader handles line endings itself), and
+    # the dict constructor consumes the filtered rows in one C-level pass.
+    with open(csv_path, 'r', encoding='utf-8', newline='') as file:
+        rows = csv.reader(file)
+        next(rows, None)  # Skip header row
+        company_data = _CompanyData((row[0], row[1]) for row in rows if len(row) >= 2)
+    company_data.key_personnel = {
+        _normalize_personnel_role(key): value
+        for key, value in company_data.items() if key.startswith('Key Personnel')
+    }
+    return company_data
+
 def load_company_data(csv_path="data.csv"):
-    """Load company data from CSV file into a dictionary."""
-    company_data = {}
+    """Load company data from CSV file into a dictionary (cached until the file changes)."""
     try:
-        with open(csv_path, 'r', encoding='utf-8') as file:
-            reader = csv.reader(file)
-            next(reader)  # Skip header row
-            for row in reader:
-                if len(row) >= 2:
-                    key, value = row[0], row[1]
-                    company_data[key] = value
+        return _load_company_data_cached(csv_path, os.stat(csv_path).st_mtime)
     except Exception as e:
         print(f"Error loading CSV data: {e}")
-    
-    return company_data
+        return {}
+
+@lru_cache(maxsize=1)
+def _template_bytes(path, mtime):
+    """Template file cached in memory — docxtpl still needs a fresh instance per render."""
+    with open(path, 'rb') as f:
+        return f.read()
+
+def render_proposal_from_template(company_data, rag_content, output_path):
+    """
+    Render the proposal from proposal_template.docx via docxtpl. Word stores the
+    static layout (styles, tables, page breaks); only the dynamic fields are
+    substituted, so one render() replaces the whole procedural build.
+    """
+    data = _template_bytes(PROPOSAL_TEMPLATE_PATH, os.stat(PROPOSAL_TEMPLATE_PATH).st_mtime)
+    tpl = DocxTemplate(BytesIO(data))
+    tpl.render({
+        'company': dict(company_data),
+        'date': datetime.now().strftime("%B %d, %Y"),
+        'rag': rag_content or {},
+    })
+    tpl.save(output_path)
+    return output_path
+
+# The PAGE field fragment is fully static — build the XML string once instead
+# of per-footer element constructions with their qn('w:...') name resolutions;
+# every w: name this module needs is pre-resolved inside the XML literals.
+_PAGE_NUMBER_XML = (
+    '<w:r %s><w:fldChar w:fldCharType="begin"/>'
+    '<w:instrText xml:space="preserve">PAGE</w:instrText>'
+    '<w:fldChar w:fldCharType="end"/></w:r>' % nsdecls('w')
+)
 
 def add_page_number(paragraph):
     """Add page numbers to the document footer."""
-    run = paragraph.add_run()
-    fldChar1 = OxmlElement('w:fldChar')
-    fldChar1.set(qn('w:fldCharType'), 'begin')
-    
-    instrText = OxmlElement('w:instrText')
-    instrText.set(qn('xml:space'), 'preserve')
-    instrText.text = "PAGE"
-    
-    fldChar2 = OxmlElement('w:fldChar')
-    fldChar2.set(qn('w:fldCharType'), 'end')
-    
-    run._element.append(fldChar1)
-    run._element.append(instrText)
-    run._element.append(fldChar2)
-    
+    paragraph._p.append(parse_xml(_PAGE_NUMBER_XML))
     return paragraph
 
+# Shared measurement constants — Pt()/RGBColor() do float→EMU math and
+# allocate on every call, so build them once.
+_PT6, _PT12, _PT14, _PT24 = Pt(6), Pt(12), Pt(14), Pt(24)
+_DARK_BLUE = RGBColor(0, 77, 113)
+
+# (style name, font size, bold, color) — one record per style to configure.
+_STYLE_SPECS = (
+    ('Heading 1', _PT24, True, _DARK_BLUE),
+    ('Heading 2', _PT14, True, _DARK_BLUE),
+    ('Normal', _PT12, False, None),
+    ('List Bullet', _PT12, False, None),
+    ('List Number', _PT12, False, None),
+)
+
 def apply_document_styling(doc):
     """Apply consistent styling to the document."""
     # Add document styles
     styles = doc.styles
-    
-    # Heading 1 style
-    if 'Heading 1' in styles:
-        style = styles['Heading 1']
-        font = style.font
-        font.name = 'Calibri'
-        font.size = Pt(24)
-        font.bold = True
-        font.color.rgb = RGBColor(0, 77, 113)  # Dark blue
-    
-    # Heading 2 style
-    if 'Heading 2' in styles:
-        style = styles['Heading 2']
-        font = style.font
-        font.name = 'Calibri'
-        font.size = Pt(14)
-        font.bold = True
-        font.color.rgb = RGBColor(0, 77, 113)  # Dark blue
-    
-    # Normal text style
-    if 'Normal' in styles:
-        style = styles['Normal']
-        font = style.font
-        font.name = 'Calibri'
-        font.size = Pt(12)
-        style.paragraph_format.line_spacing_rule = WD_LINE_SPACING.SINGLE
-        style.paragraph_format.space_after = Pt(6)
-    
-    # List Bullet style
-    if 'List Bullet' in styles:
-        style = styles['List Bullet']
-        font = style.font
-        font.name = 'Calibri'
-        font.size = Pt(12)
-    
-    # List Number style
-    if 'List Number' in styles:
-        style = styles['List Number']
+
+    # One lookup per style instead of separate __contains__/__getitem__ pairs.
+    for name, size, bold, color in _STYLE_SPECS:
+        if name not in styles:
+            continue
+        style = styles[name]
         font = style.font
         font.name = 'Calibri'
-        font.size = Pt(12)
-    
+        font.size = size
+        if bold:
+            font.bold = True
+        if color is not None:
+            font.color.rgb = color
+        if name == 'Normal':
+            style.paragraph_format.line_spacing_rule = WD_LINE_SPACING.SINGLE
+            style.paragraph_format.space_after = _PT6
+
     # Add footer with page numbers
     section = doc.sections[0]
     footer = section.footer
@@ -101,152 +140,247 @@ def apply_document_styling(doc):
     
     return doc
 
+# ---------------------------------------------------------------------------
+# Raw-XML page building. python-docx walks and mutates the body tree on every
+# add_paragraph/add_run/attribute write; composing each page as WordprocessingML
+# string fragments and appending them in one lxml parse cuts that per-call
+# overhead to a single parse per page.
+# ---------------------------------------------------------------------------
+
+_NSDECLS_W = nsdecls('w')
+
+# XML escaping via one C-level str.translate pass instead of saxutils.escape's
+# chained Python-level replaces.
+_XML_ESCAPE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'})
+
+
+def _esc(s):
+    return s.translate(_XML_ESCAPE) if s else ''
+
+# Twips (twentieths of a point / 1440ths of an inch) for the XML attributes.
+_TW_HALF_INCH = 720
+_TW_ONE_INCH = 1440
+
+
+def _run(text, bold=False, italic=False, underline=False, size_pt=None):
+    """One <w:r> fragment with optional run properties; text is XML-escaped."""
+    props = []
+    if bold:
+        props.append('<w:b/>')
+    if italic:
+        props.append('<w:i/>')
+    if size_pt is not None:
+        props.append('<w:sz w:val="%d"/>' % (size_pt * 2))
+    if underline:
+        props.append('<w:u w:val="single"/>')
+    rpr = '<w:rPr>%s</w:rPr>' % ''.join(props) if props else ''
+    return '<w:r>%s<w:t xml:space="preserve">%s</w:t></w:r>' % (rpr, _esc(str(text)))
+
+
+def _para(*runs, style=None, center=False, indent=None):
+    """One <w:p> fragment wrapping prebuilt _run fragments."""
+    props = []
+    if style:
+        props.append('<w:pStyle w:val="%s"/>' % style)
+    if indent is not None:
+        props.append('<w:ind w:left="%d"/>' % indent)
+    if center:
+        props.append('<w:jc w:val="center"/>')
+    ppr = '<w:pPr>%s</w:pPr>' % ''.join(props) if props else ''
+    return '<w:p>%s%s</w:p>' % (ppr, ''.join(runs))
+
+
+# Pre-resolved Clark name for the body-level section properties element.
+_SECT_PR_TAG = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}sectPr'
+
+
+def _append_xml_block(doc, fragments):
+    """Append a list of <w:p>/<w:tbl> fragments to the body in one lxml parse."""
+    block = parse_xml('<w:body %s>%s</w:body>' % (_NSDECLS_W, ''.join(fragments)))
+    body = doc.element.body
+    # Content must land before the trailing <w:sectPr> (where python-docx
+    # inserts paragraphs), not after it.
+    sect_pr = body.find(_SECT_PR_TAG)
+    for child in list(block):
+        if sect_pr is not None:
+            sect_pr.addprevious(child)
+        else:
+            body.append(child)
+
+
+def _tbl(rows, style_id=None):
+    """One <w:tbl> fragment from rows of prebuilt _para cell fragments."""
+    tbl_pr = '<w:tblPr>%s<w:tblW w:w="0" w:type="auto"/></w:tblPr>' % (
+        '<w:tblStyle w:val="%s"/>' % style_id if style_id else '')
+    grid = '<w:tblGrid>%s</w:tblGrid>' % ('<w:gridCol/>' * len(rows[0]))
+    body_rows = ''.join(
+        '<w:tr>%s</w:tr>' % ''.join('<w:tc>%s</w:tc>' % cell for cell in row)
+        for row in rows
+    )
+    return '<w:tbl>%s%s%s</w:tbl>' % (tbl_pr, grid, body_rows)
+
+
+# The cover page is fully static apart from a handful of company-data fields,
+# so the whole Page 1 layout lives in one WordprocessingML literal. A single
+# parse_xml of the formatted block replaces ~12 add_paragraph/add_run calls and
+# their per-paragraph alignment/bold/italic attribute writes. (w:spacing w:after
+# is in twentieths of a point: 480 = 24pt, 720 = 36pt.)
+_COVER_PAGE_XML = (
+    # Title - Heading 1, center-aligned
+    '<w:p><w:pPr><w:pStyle w:val="Heading1"/><w:jc w:val="center"/></w:pPr>'
+    '<w:r><w:t>PROPOSAL DOCUMENT</w:t></w:r></w:p>'
+    # Company name - same styling, 36pt space after
+    '<w:p><w:pPr><w:pStyle w:val="Heading1"/><w:spacing w:after="720"/><w:jc w:val="center"/></w:pPr>'
+    '<w:r><w:t>{company_name}</w:t></w:r></w:p>'
+    # Prepared By - Heading 2
+    '<w:p><w:pPr><w:pStyle w:val="Heading2"/><w:jc w:val="center"/></w:pPr>'
+    '<w:r><w:t>Prepared By:</w:t></w:r></w:p>'
+    '<w:p><w:pPr><w:spacing w:after="480"/><w:jc w:val="center"/></w:pPr>'
+    '<w:r><w:rPr><w:b/></w:rPr><w:t>{company_name}</w:t></w:r></w:p>'
+    # Submission Date - Normal, bold label
+    '<w:p><w:pPr><w:spacing w:after="480"/><w:jc w:val="center"/></w:pPr>'
+    '<w:r><w:rPr><w:b/></w:rPr><w:t xml:space="preserve">Submission Date: </w:t></w:r>'
+    '<w:r><w:t>{date}</w:t></w:r></w:p>'
+    # Contact info - separate centered paragraphs
+    '<w:p><w:pPr><w:jc w:val="center"/></w:pPr>'
+    '<w:r><w:rPr><w:b/></w:rPr><w:t>Contact Information:</w:t></w:r></w:p>'
+    '<w:p><w:pPr><w:jc w:val="center"/></w:pPr><w:r><w:t>{address}</w:t></w:r></w:p>'
+    '<w:p><w:pPr><w:jc w:val="center"/></w:pPr><w:r><w:t>Phone: {phone}</w:t></w:r></w:p>'
+    '<w:p><w:pPr><w:spacing w:after="720"/><w:jc w:val="center"/></w:pPr>'
+    '<w:r><w:t>Email: {email}</w:t></w:r></w:p>'
+    # Authorized Representative - bold name, italic title
+    '<w:p><w:pPr><w:jc w:val="center"/></w:pPr>'
+    '<w:r><w:rPr><w:b/></w:rPr><w:t xml:space="preserve">Authorized Representative: </w:t></w:r>'
+    '<w:r><w:rPr><w:b/></w:rPr><w:t>{rep}</w:t></w:r></w:p>'
+    '<w:p><w:pPr><w:jc w:val="center"/></w:pPr>'
+    '<w:r><w:rPr><w:i/></w:rPr><w:t>{rep_title}</w:t></w:r></w:p>'
+)
+
 def add_cover_page(doc, company_data):
     """Add a professional cover page to the document following Page 1 specs."""
-    # Add title - Heading 1, center-aligned, font size 24pt, bold
-    title = doc.add_paragraph(style='Heading 1')
-    title_run = title.add_run("PROPOSAL DOCUMENT")
-    title.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-    
-    # Add company name with same styling
-    company_name = doc.add_paragraph(style='Heading 1')
-    company_name_run = company_name.add_run(company_data.get('Company Legal Name', 'Company Name'))
-    company_name.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-    company_name.space_after = Pt(36)
-    
-    # Prepared For/By - Heading 2, font size 14pt, bold
-    prepared_by = doc.add_paragraph(style='Heading 2')
-    prepared_by_run = prepared_by.add_run("Prepared By:")
-    prepared_by.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-    
-    company = doc.add_paragraph()
-    company_run = company.add_run(company_data.get('Company Legal Name', 'Company Name'))
-    company_run.bold = True
-    company.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-    company.space_after = Pt(24)
-    
-    # Submission Date - Normal, font size 12pt
-    from datetime import datetime
-    date_para = doc.add_paragraph()
-    date_para.add_run("Submission Date: ").bold = True
-    date_para.add_run(datetime.now().strftime("%B %d, %Y"))
-    date_para.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-    date_para.space_after = Pt(24)
-    
-    # Contact Info - Using separate Paragraphs, center-aligned
-    contact_info = doc.add_paragraph()
-    contact_info.add_run("Contact Information:").bold = True
-    contact_info.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-    
-    address = doc.add_paragraph()
-    address.add_run(company_data.get('Principal Business Address', ''))
-    address.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-    
-    phone = doc.add_paragraph()
-    phone.add_run(f"Phone: {company_data.get('Phone Number', '')}")
-    phone.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-    
-    email = doc.add_paragraph()
-    email.add_run(f"Email: {company_data.get('Email Address', '')}")
-    email.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-    email.space_after = Pt(36)
-    
-    # Authorized Representative - Normal, bold name, title italicized
-    auth_rep = doc.add_paragraph()
-    auth_rep.add_run("Authorized Representative: ").bold = True
-    auth_rep.add_run(company_data.get('Authorized Representative', '')).bold = True
-    auth_rep.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-    
-    auth_title = doc.add_paragraph()
-    title_run = auth_title.add_run(company_data.get('Authorized Representative Title', ''))
-    title_run.italic = True
-    auth_title.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-    
+    values = {
+        'company_name': company_data.get('Company Legal Name', 'Company Name'),
+        'date': datetime.now().strftime("%B %d, %Y"),
+        'address': company_data.get('Principal Business Address', ''),
+        'phone': company_data.get('Phone Number', ''),
+        'email': company_data.get('Email Address', ''),
+        'rep': company_data.get('Authorized Representative', ''),
+        'rep_title': company_data.get('Authorized Representative Title', ''),
+    }
+    escaped = {k: _esc(str(v)) for k, v in values.items()}
+    # One lxml parse for the whole page, inserted before <w:sectPr> like every
+    # other builder.
+    _append_xml_block(doc, [_COVER_PAGE_XML.format(**escaped)])
+
     # Add page break at the end of cover page
     doc.add_page_break()
-    
+
     return doc
 
+# Fallback copy used only when RAG content is unavailable; hoisted so the
+# builders interpolate on demand instead of composing f-strings every call.
+_EXEC_SUMMARY_FALLBACK = (
+    "{name} is pleased to submit this proposal for providing {services}. "
+    "With {years} of experience, we are uniquely qualified to deliver "
+    "high-quality solutions that meet your needs."
+)
+_APPROACH_FALLBACK = (
+    "Our comprehensive approach to service delivery ensures high-quality "
+    "results through systematic planning, execution, and monitoring processes."
+)
+
 def add_executive_summary(doc, company_data, rag_content=None):
     """Add executive summary page following Page 2 specs."""
-    # Section Title - Heading 1, font size 18pt, underline
-    exec_summary = doc.add_paragraph(style='Heading 1')
-    exec_summary_run = exec_summary.add_run("EXECUTIVE SUMMARY")
-    exec_summary_run.underline = True
-    exec_summary_run.font.size = Pt(18)
-    
+    years = company_data.get('Years of Experience in Temporary Staffing', '')
+
     # Body Text - Normal, 12pt, left-aligned
     # Use provided RAG content if available, otherwise use generic content
-    if rag_content and rag_content.get('executive_summary'):
-        summary_content = rag_content['executive_summary']
-    else:
-        # Fallback content if RAG content not available
-        summary_content = f"{company_data.get('Company Legal Name', 'Our company')} is pleased to submit this proposal for providing {company_data.get('Services Provided', 'professional services')}. With {company_data.get('Years of Experience in Temporary Staffing', '')} of experience, we are uniquely qualified to deliver high-quality solutions that meet your needs."
-    
-    doc.add_paragraph(summary_content)
-    
-    # Key Benefits section - Bold to emphasize key phrases
-    benefits_title = doc.add_paragraph()
-    benefits_title.add_run("KEY BENEFITS").bold = True
-    
-    # Bullet Points - Use Paragraph().style = 'List Bullet'
+    summary_content = (rag_content or {}).get('executive_summary')
+    if not summary_content:
+        summary_content = _EXEC_SUMMARY_FALLBACK.format(
+            name=company_data.get('Company Legal Name', 'Our company'),
+            services=company_data.get('Services Provided', 'professional services'),
+            years=years,
+        )
+
+    fragments = [
+        # Section Title - Heading 1, font size 18pt, underline
+        _para(_run("EXECUTIVE SUMMARY", underline=True, size_pt=18), style='Heading1'),
+        _para(_run(summary_content)),
+        # Key Benefits section - Bold to emphasize key phrases
+        _para(_run("KEY BENEFITS", bold=True)),
+    ]
+
     benefits = [
         "Experienced team with specialized expertise",
-        f"{company_data.get('Years of Experience in Temporary Staffing', '')} of industry experience",
+        f"{years} of industry experience",
         "Proven track record of success",
         "Customized solutions tailored to your needs",
         "Exceptional customer service and support"
     ]
-    
+
     for benefit in benefits:
-        bullet = doc.add_paragraph(style='List Bullet')
         parts = benefit.split(' with ')
         if len(parts) > 1:
-            bullet.add_run(parts[0]).bold = True
-            bullet.add_run(f" with {parts[1]}")
+            fragments.append(_para(
+                _run(parts[0], bold=True), _run(f" with {parts[1]}"),
+                style='ListBullet',
+            ))
         else:
-            bullet.add_run(benefit)
-    
+            fragments.append(_para(_run(benefit), style='ListBullet'))
+
+    _append_xml_block(doc, fragments)
+
     # Add page break at the end
     doc.add_page_break()
-    
+
     return doc
 
 def add_company_overview(doc, company_data):
     """Add company overview page following Page 3 specs."""
-    # Section Title - Heading 1
-    doc.add_paragraph("COMPANY OVERVIEW & EXPERIENCE", style='Heading 1')
-    
-    # Subsections - Use bold Normal
-    company_info = doc.add_paragraph()
-    company_info.add_run(f"{company_data.get('Company Legal Name', 'Our company')} is a {company_data.get('Business Structure', 'professional organization')} established {company_data.get('Company Length of Existence', '')} ago. We specialize in providing {company_data.get('Services Provided', 'staffing services')}.")
-    
-    # Company identifiers and registrations - Bold
-    identifiers = doc.add_paragraph()
-    
-    # DUNS, NAICS, CAGE Code
-    if 'DUNS Number' in company_data:
-        identifiers.add_run("DUNS Number: ").bold = True
-        identifiers.add_run(f"{company_data.get('DUNS Number', '')}\n")
-    
-    if 'CAGE Code' in company_data:
-        identifiers.add_run("CAGE Code: ").bold = True
-        identifiers.add_run(f"{company_data.get('CAGE Code', '')}\n")
-    
-    if 'NAICS Codes' in company_data:
-        identifiers.add_run("NAICS Codes: ").bold = True
-        identifiers.add_run(f"{company_data.get('NAICS Codes', '')}\n")
-    
-    if 'State Registration Number' in company_data:
-        identifiers.add_run("State Registration: ").bold = True
-        identifiers.add_run(f"{company_data.get('State Registration Number', '')}")
-    
+    # Bind every key once up front — single dict probes instead of repeated
+    # membership test + .get pairs below.
+    legal_name = company_data.get('Company Legal Name', 'Our company')
+    structure = company_data.get('Business Structure', 'professional organization')
+    existence = company_data.get('Company Length of Existence', '')
+    services = company_data.get('Services Provided', 'staffing services')
+    years = company_data.get('Years of Experience in Temporary Staffing', '')
+    duns = company_data.get('DUNS Number')
+    cage = company_data.get('CAGE Code')
+    naics = company_data.get('NAICS Codes')
+    state_reg = company_data.get('State Registration Number')
+
+    fragments = [
+        # Section Title - Heading 1
+        _para(_run("COMPANY OVERVIEW & EXPERIENCE"), style='Heading1'),
+        # Subsections - Use bold Normal
+        _para(_run(f"{legal_name} is a {structure} established {existence} ago. We specialize in providing {services}.")),
+    ]
+
+    # Company identifiers and registrations - Bold labels in one paragraph
+    identifier_runs = []
+    if duns is not None:
+        identifier_runs.append(_run("DUNS Number: ", bold=True))
+        identifier_runs.append(_run(f"{duns}\n"))
+
+    if cage is not None:
+        identifier_runs.append(_run("CAGE Code: ", bold=True))
+        identifier_runs.append(_run(f"{cage}\n"))
+
+    if naics is not None:
+        identifier_runs.append(_run("NAICS Codes: ", bold=True))
+        identifier_runs.append(_run(f"{naics}\n"))
+
+    if state_reg is not None:
+        identifier_runs.append(_run("State Registration: ", bold=True))
+        identifier_runs.append(_run(f"{state_reg}"))
+
+    fragments.append(_para(*identifier_runs))
+
     # Past Experience - Use List Bullet
-    doc.add_paragraph("PAST EXPERIENCE", style='Heading 2')
-    
-    experience_intro = doc.add_paragraph()
-    experience_intro.add_run(f"With {company_data.get('Years of Experience in Temporary Staffing', '')} in the industry, we have successfully delivered staffing solutions across various sectors. Our experience includes:")
-    
+    fragments.append(_para(_run("PAST EXPERIENCE"), style='Heading2'))
+    fragments.append(_para(_run(f"With {years} in the industry, we have successfully delivered staffing solutions across various sectors. Our experience includes:")))
+
     # Sample experience points (would ideally come from RAG or additional data)
     experiences = [
         "Government agency staffing and workforce management",
@@ -255,14 +389,13 @@ def add_company_overview(doc, company_data):
         "IT and technical professional placements",
         "Administrative and support staff services"
     ]
-    
+
     for exp in experiences:
-        bullet = doc.add_paragraph(style='List Bullet')
-        bullet.add_run(exp)
-    
+        fragments.append(_para(_run(exp), style='ListBullet'))
+
     # Special Qualifications - Italics or bold keywords
-    doc.add_paragraph("SPECIAL QUALIFICATIONS", style='Heading 2')
-    
+    fragments.append(_para(_run("SPECIAL QUALIFICATIONS"), style='Heading2'))
+
     qualifications = [
         "Rapid deployment of qualified personnel",
         "Stringent vetting and security clearance processes",
@@ -270,41 +403,75 @@ def add_company_overview(doc, company_data):
         "Dedicated account management",
         f"{company_data.get('Historically Underutilized Business/DBE Status', 'Business status')}"
     ]
-    
+
     for qual in qualifications:
-        bullet = doc.add_paragraph(style='List Bullet')
         if ":" in qual:
             parts = qual.split(":")
-            bullet.add_run(f"{parts[0]}:").bold = True
-            bullet.add_run(parts[1])
+            fragments.append(_para(
+                _run(f"{parts[0]}:", bold=True), _run(parts[1]),
+                style='ListBullet',
+            ))
         else:
-            bullet.add_run(qual)
-    
+            fragments.append(_para(_run(qual), style='ListBullet'))
+
+    _append_xml_block(doc, fragments)
+
     # Add page break at the end
     doc.add_page_break()
-    
+
     return doc
 
+# Both fixed-shape tables (7×2 timeline, 5×2 pricing) are built once at import
+# — header bold/centering baked in — instead of add_table plus cell-by-cell
+# .text assignments (each of which clears and rebuilds the cell's XML).
+_TIMELINE_TABLE_XML = _tbl(
+    [[_para(_run("Phase", bold=True), center=True),
+      _para(_run("Timeline", bold=True), center=True)]] +
+    [[_para(_run(phase)), _para(_run(time))] for phase, time in (
+        ("Initial Consultation", "Week 1"),
+        ("Requirements Analysis", "Week 1-2"),
+        ("Candidate Sourcing", "Week 2-3"),
+        ("Interviews & Selection", "Week 3-4"),
+        ("Onboarding", "Week 4-5"),
+        ("Performance Monitoring", "Ongoing"),
+    )],
+    style_id='LightGrid-Accent1',
+)
+
+_PRICING_TABLE_XML = _tbl(
+    [[_para(_run("Service Category", bold=True), center=True),
+      _para(_run("Rate", bold=True), center=True)]] +
+    [[_para(_run(service)), _para(_run(rate))] for service, rate in (
+        ("Administrative Staffing", "$XX.XX - $XX.XX per hour"),
+        ("Technical Staffing", "$XX.XX - $XX.XX per hour"),
+        ("Management Staffing", "$XX.XX - $XX.XX per hour"),
+        ("Special Services", "Custom quote based on requirements"),
+    )],
+    style_id='LightGrid-Accent1',
+)
+
+# Signature table: only the representative fields vary per company.
+_SIGNATURE_TABLE_XML = _tbl([
+    [_para(_run("Authorized Representative:")), _para(_run("{rep}"))],
+    [_para(_run("Title:")), _para(_run("{rep_title}"))],
+    [_para(_run("Signature:")), _para(_run("_______________________________"))],
+])
+
 def add_scope_and_approach(doc, rag_content=None):
     """Add scope of work page following Page 4 specs."""
-    # Section Title - Heading 1
-    doc.add_paragraph("SCOPE OF WORK & SOLUTION APPROACH", style='Heading 1')
-    
     # Use provided RAG content if available, otherwise use generic content
-    if rag_content and rag_content.get('approach'):
-        approach_content = rag_content['approach']
-    else:
-        # Fallback content if RAG content not available
-        approach_content = "Our comprehensive approach to service delivery ensures high-quality results through systematic planning, execution, and monitoring processes."
-    
-    doc.add_paragraph(approach_content)
-    
-    # Subsection Titles - Heading 2
-    doc.add_paragraph("IMPLEMENTATION METHODOLOGY", style='Heading 2')
-    
-    # Step-by-Step Plan - Use numbered list
-    doc.add_paragraph("Our implementation follows a proven step-by-step process:")
-    
+    approach_content = (rag_content or {}).get('approach') or _APPROACH_FALLBACK
+
+    fragments = [
+        # Section Title - Heading 1
+        _para(_run("SCOPE OF WORK & SOLUTION APPROACH"), style='Heading1'),
+        _para(_run(approach_content)),
+        # Subsection Titles - Heading 2
+        _para(_run("IMPLEMENTATION METHODOLOGY"), style='Heading2'),
+        # Step-by-Step Plan - Use numbered list
+        _para(_run("Our implementation follows a proven step-by-step process:")),
+    ]
+
     steps = [
         "Requirements gathering and analysis",
         "Staffing plan development",
@@ -313,50 +480,23 @@ def add_scope_and_approach(doc, rag_content=None):
         "Performance monitoring and reporting",
         "Continuous improvement"
     ]
-    
-    for i, step in enumerate(steps, 1):
-        bullet = doc.add_paragraph(style='List Number')
-        bullet.add_run(f"{step}").bold = True
-        # Add a brief description
-        bullet.add_run(f" - Ensuring alignment with your specific needs and objectives.")
-    
-    # Timeline - Use a table
-    doc.add_paragraph("IMPLEMENTATION TIMELINE", style='Heading 2')
-    doc.add_paragraph("Below is our estimated timeline for full implementation:")
-    
-    timeline_table = doc.add_table(rows=7, cols=2)
-    timeline_table.style = 'Light Grid Accent 1'
-    
-    # Header row
-    header_cells = timeline_table.rows[0].cells
-    header_cells[0].text = "Phase"
-    header_cells[1].text = "Timeline"
-    
-    # Style header row
-    for cell in header_cells:
-        for paragraph in cell.paragraphs:
-            paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-            for run in paragraph.runs:
-                run.bold = True
-    
-    # Timeline data
-    timeline_data = [
-        ("Initial Consultation", "Week 1"),
-        ("Requirements Analysis", "Week 1-2"),
-        ("Candidate Sourcing", "Week 2-3"),
-        ("Interviews & Selection", "Week 3-4"),
-        ("Onboarding", "Week 4-5"),
-        ("Performance Monitoring", "Ongoing")
-    ]
-    
-    for i, (phase, time) in enumerate(timeline_data, 1):
-        row = timeline_table.rows[i].cells
-        row[0].text = phase
-        row[1].text = time
-    
+
+    for step in steps:
+        fragments.append(_para(
+            _run(step, bold=True),
+            _run(" - Ensuring alignment with your specific needs and objectives."),
+            style='ListNumber',
+        ))
+
+    # Timeline - the table content is fixed, so the whole <w:tbl> is a module
+    # constant and joins the same XML block as the surrounding paragraphs.
+    fragments.append(_para(_run("IMPLEMENTATION TIMELINE"), style='Heading2'))
+    fragments.append(_para(_run("Below is our estimated timeline for full implementation:")))
+    fragments.append(_TIMELINE_TABLE_XML)
+
     # Tools & Deliverables - Use bold keywords
-    doc.add_paragraph("TOOLS & DELIVERABLES", style='Heading 2')
-    
+    fragments.append(_para(_run("TOOLS & DELIVERABLES"), style='Heading2'))
+
     deliverables = [
         "Staffing plan documentation",
         "Candidate selection reports",
@@ -364,42 +504,42 @@ def add_scope_and_approach(doc, rag_content=None):
         "Quality assurance documentation",
         "Regular status reports"
     ]
-    
+
     for deliv in deliverables:
-        bullet = doc.add_paragraph(style='List Bullet')
-        bullet.add_run(f"✓ {deliv}")
-    
+        fragments.append(_para(_run(f"✓ {deliv}"), style='ListBullet'))
+
+    _append_xml_block(doc, fragments)
+
     # Add page break at the end
     doc.add_page_break()
-    
+
     return doc
 
 def add_personnel_section(doc, company_data):
     """Add key personnel page following Page 5 specs."""
-    # Section Title - Heading 1
-    doc.add_paragraph("KEY PERSONNEL & STAFFING PLAN", style='Heading 1')
-    
-    doc.add_paragraph("Our team brings extensive expertise and experience to ensure the successful delivery of all project requirements.")
-    
-    # Find all key personnel entries in the company data
-    key_personnel = {k: v for k, v in company_data.items() if k.startswith('Key Personnel')}
-    
+    fragments = [
+        # Section Title - Heading 1
+        _para(_run("KEY PERSONNEL & STAFFING PLAN"), style='Heading1'),
+        _para(_run("Our team brings extensive expertise and experience to ensure the successful delivery of all project requirements.")),
+    ]
+
+    # Key personnel were grouped (and role labels normalized) when the CSV was
+    # loaded; the scan fallback covers plain dicts passed in directly.
+    key_personnel = getattr(company_data, 'key_personnel', None)
+    if key_personnel is None:
+        key_personnel = {
+            _normalize_personnel_role(k): v
+            for k, v in company_data.items() if k.startswith('Key Personnel')
+        }
+
     if key_personnel:
-        for role, name in key_personnel.items():
+        for role_desc, name in key_personnel.items():
             # Personnel Names - Heading 2, bold
-            role_desc = role.replace('Key Personnel â€" ', '').replace('Key Personnel – ', '')
-            
-            person_heading = doc.add_paragraph(style='Heading 2')
-            person_heading.add_run(name)
-            
-            # Role heading
-            role_para = doc.add_paragraph()
-            role_para.add_run(f"Role: {role_desc}").bold = True
-            
+            fragments.append(_para(_run(name), style='Heading2'))
+            fragments.append(_para(_run(f"Role: {role_desc}", bold=True)))
             # Background - Normal with bullet list
-            background = doc.add_paragraph()
-            background.add_run("Background & Qualifications:").bold = True
-            
+            fragments.append(_para(_run("Background & Qualifications:", bold=True)))
+
             # Example qualifications (these would ideally come from another data source)
             qualifications = [
                 f"Over 10 years of experience in {role_desc}",
@@ -407,126 +547,77 @@ def add_personnel_section(doc, company_data):
                 "Certified Professional in relevant field",
                 "Proven track record of successful project delivery"
             ]
-            
+
             for qual in qualifications:
-                bullet = doc.add_paragraph(style='List Bullet')
-                bullet.add_run(qual)
+                fragments.append(_para(_run(qual), style='ListBullet'))
     else:
-        doc.add_paragraph("Key personnel information not available.")
-    
+        fragments.append(_para(_run("Key personnel information not available.")))
+
     # Org Chart representation as nested bullets
-    doc.add_paragraph("ORGANIZATIONAL STRUCTURE", style='Heading 2')
-    
-    doc.add_paragraph("Our staffing organization is structured to provide clear lines of communication and accountability:")
-    
+    fragments.append(_para(_run("ORGANIZATIONAL STRUCTURE"), style='Heading2'))
+    fragments.append(_para(_run("Our staffing organization is structured to provide clear lines of communication and accountability:")))
+
     # Level 1
-    l1 = doc.add_paragraph(style='List Bullet')
-    l1.add_run("Project Manager").bold = True
-    
+    fragments.append(_para(_run("Project Manager", bold=True), style='ListBullet'))
     # Level 2 - indented bullets
-    l2a = doc.add_paragraph(style='List Bullet')
-    l2a.paragraph_format.left_indent = Inches(0.5)
-    l2a.add_run("Technical Lead").bold = True
-    
-    l2b = doc.add_paragraph(style='List Bullet')
-    l2b.paragraph_format.left_indent = Inches(0.5)
-    l2b.add_run("Administrative Lead").bold = True
-    
+    fragments.append(_para(_run("Technical Lead", bold=True), style='ListBullet', indent=_TW_HALF_INCH))
+    fragments.append(_para(_run("Administrative Lead", bold=True), style='ListBullet', indent=_TW_HALF_INCH))
     # Level 3 - further indented
-    l3a = doc.add_paragraph(style='List Bullet')
-    l3a.paragraph_format.left_indent = Inches(1.0)
-    l3a.add_run("Technical Staff")
-    
-    l3b = doc.add_paragraph(style='List Bullet')
-    l3b.paragraph_format.left_indent = Inches(1.0)
-    l3b.add_run("Administrative Support Staff")
-    
+    fragments.append(_para(_run("Technical Staff"), style='ListBullet', indent=_TW_ONE_INCH))
+    fragments.append(_para(_run("Administrative Support Staff"), style='ListBullet', indent=_TW_ONE_INCH))
+
     # Availability - Emphasize with bold
-    avail_para = doc.add_paragraph()
-    avail_para.add_run("AVAILABILITY: ").bold = True
-    avail_para.add_run("Our team provides ").italic = False
-    avail_para.add_run("24/7 availability").bold = True
-    avail_para.add_run(" for critical issues with standard support during business hours for routine matters.")
-    
+    fragments.append(_para(
+        _run("AVAILABILITY: ", bold=True),
+        _run("Our team provides "),
+        _run("24/7 availability", bold=True),
+        _run(" for critical issues with standard support during business hours for routine matters."),
+    ))
+
+    _append_xml_block(doc, fragments)
+
     # Add page break at the end
     doc.add_page_break()
-    
+
     return doc
 
 def add_pricing_section(doc, company_data, rag_content=None):
     """Add pricing page following Page 6 specs."""
-    # Section Title - Heading 1
-    doc.add_paragraph("PRICING & FINAL NOTES", style='Heading 1')
-    
-    # Pricing intro
-    pricing_intro = doc.add_paragraph()
-    pricing_intro.add_run("Our pricing structure is designed to provide maximum value while maintaining competitive rates. All pricing is based on the specific requirements outlined in the RFP document.")
-    
-    # Pricing table
-    doc.add_paragraph("PRICING SCHEDULE", style='Heading 2')
-    
-    # Create pricing table - Use table
-    price_table = doc.add_table(rows=5, cols=2)
-    price_table.style = 'Light Grid Accent 1'
-    
-    # Header row
-    header_cells = price_table.rows[0].cells
-    header_cells[0].text = "Service Category"
-    header_cells[1].text = "Rate"
-    
-    # Style header row
-    for cell in header_cells:
-        for paragraph in cell.paragraphs:
-            paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-            for run in paragraph.runs:
-                run.bold = True
-    
-    # Sample pricing data (would be customized based on actual offerings)
-    pricing_data = [
-        ("Administrative Staffing", "$XX.XX - $XX.XX per hour"),
-        ("Technical Staffing", "$XX.XX - $XX.XX per hour"),
-        ("Management Staffing", "$XX.XX - $XX.XX per hour"),
-        ("Special Services", "Custom quote based on requirements")
+    fragments = [
+        # Section Title - Heading 1
+        _para(_run("PRICING & FINAL NOTES"), style='Heading1'),
+        # Pricing intro
+        _para(_run("Our pricing structure is designed to provide maximum value while maintaining competitive rates. All pricing is based on the specific requirements outlined in the RFP document.")),
+        # Pricing table - prebuilt, sample rates baked in
+        _para(_run("PRICING SCHEDULE"), style='Heading2'),
+        _PRICING_TABLE_XML,
+        # Optional Services - Italicize
+        _para(_run("OPTIONAL SERVICES"), style='Heading2'),
     ]
-    
-    for i, (service, rate) in enumerate(pricing_data, 1):
-        row = price_table.rows[i].cells
-        row[0].text = service
-        row[1].text = rate
-    
-    # Optional Services - Italicize
-    doc.add_paragraph("OPTIONAL SERVICES", style='Heading 2')
-    
+
     optional_services = [
         "Extended support hours",
         "On-site management",
         "Specialized training",
         "Performance analytics and reporting"
     ]
-    
+
     for service in optional_services:
-        bullet = doc.add_paragraph(style='List Bullet')
-        bullet_run = bullet.add_run(service)
-        bullet_run.italic = True
-    
+        fragments.append(_para(_run(service, italic=True), style='ListBullet'))
+
     # Call to Action - Center-aligned paragraph, bold
-    cta = doc.add_paragraph()
-    cta_run = cta.add_run("CONTACT US TODAY TO DISCUSS YOUR SPECIFIC REQUIREMENTS")
-    cta_run.bold = True
-    cta.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-    
+    fragments.append(_para(
+        _run("CONTACT US TODAY TO DISCUSS YOUR SPECIFIC REQUIREMENTS", bold=True),
+        center=True,
+    ))
     # Signature Line - Use a table for structured signing
-    doc.add_paragraph("AUTHORIZATION", style='Heading 2')
-    
-    # Signature table
-    sig_table = doc.add_table(rows=3, cols=2)
-    sig_table.cell(0, 0).text = "Authorized Representative:"
-    sig_table.cell(0, 1).text = company_data.get('Authorized Representative', '')
-    sig_table.cell(1, 0).text = "Title:"
-    sig_table.cell(1, 1).text = company_data.get('Authorized Representative Title', '')
-    sig_table.cell(2, 0).text = "Signature:"
-    sig_table.cell(2, 1).text = "_______________________________"
-    
+    fragments.append(_para(_run("AUTHORIZATION"), style='Heading2'))
+    fragments.append(_SIGNATURE_TABLE_XML.format(
+        rep=_esc(company_data.get('Authorized Representative', '')),
+        rep_title=_esc(company_data.get('Authorized Representative Title', '')),
+    ))
+    _append_xml_block(doc, fragments)
+
     return doc
 
 def generate_proposal_document(folder_name=None, get_rag_content_func=None, output_path="generated_proposal.docx"):
@@ -549,13 +640,18 @@ def generate_proposal_document(folder_name=None, get_rag_content_func=None, outp
     rag_content = None
     if get_rag_content_func and folder_name:
         rag_content = get_rag_content_func(folder_name)
-    
-    # Create a new Document
-    doc = Document()
-    
-    # Apply consistent styling
-    doc = apply_document_styling(doc)
-    
+
+    # Template-driven fast path: when docxtpl and the authored template are
+    # available, a single render call replaces the procedural build below.
+    if DocxTemplate is not None and os.path.exists(PROPOSAL_TEMPLATE_PATH):
+        output_path = render_proposal_from_template(company_data, rag_content, output_path)
+        print(f"Document generated successfully: {output_path}")
+        return output_path
+
+    # Clone the pre-styled skeleton instead of re-parsing the default template
+    # and re-applying styles per call.
+    doc = Document(BytesIO(_get_skeleton_bytes()))
+
     # Page 1: Cover Page
     doc = add_cover_page(doc, company_data)
     
@@ -574,12 +670,62 @@ def generate_proposal_document(folder_name=None, get_rag_content_func=None, outp
     # Page 6: Pricing & Final Notes
     doc = add_pricing_section(doc, company_data, rag_content)
     
-    # Save the document
-    doc.save(output_path)
+    # Serialize in memory, then write once and swap into place — a single large
+    # write beats incremental file handling (especially on network paths), and
+    # a crash can't leave a half-written .docx at output_path.
+    buf = BytesIO()
+    doc.save(buf)
+    tmp_path = output_path + '.tmp'
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, buf.getbuffer())
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, output_path)
     print(f"Document generated successfully: {output_path}")
-    
+
     return output_path
 
+# apply_document_styling always produces the same styled empty document, so
+# serialize it once and clone from bytes per generation — skips the default
+# template parse and the style mutations on every call. Built lazily so merely
+# importing the module stays cheap.
+_skeleton_bytes = None
+
+def _get_skeleton_bytes():
+    global _skeleton_bytes
+    if _skeleton_bytes is None:
+        buf = BytesIO()
+        apply_document_styling(Document()).save(buf)
+        _skeleton_bytes = buf.getvalue()
+    return _skeleton_bytes
+
+def _bulk_worker(args):
+    """Per-process entry point for generate_proposals_bulk (must be picklable)."""
+    folder_name, get_rag_content_func, output_path = args
+    return generate_proposal_document(folder_name, get_rag_content_func, output_path)
+
+def generate_proposals_bulk(folders, get_rag_content_func=None, out_dir="generated_proposals"):
+    """
+    Generate one proposal per folder in parallel across CPU cores.
+
+    Each generation is independent and CPU-bound on python-docx's XML
+    serialization, so a process pool sidesteps the GIL and scales with cores.
+    Workers reload company data themselves (cheap — it's lru_cache'd per
+    process). get_rag_content_func must be a module-level function so it can be
+    pickled into the workers.
+
+    Returns the list of output paths, one per folder.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = [
+        (folder, get_rag_content_func, os.path.join(out_dir, f"{folder}.docx"))
+        for folder in folders
+    ]
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        return list(executor.map(_bulk_worker, jobs))
+
 # Example usage:
 if __name__ == "__main__":
     # This would be called with the selected document from the Streamlit app
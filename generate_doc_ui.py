@@ -1,13 +1,24 @@
 import streamlit as st
-from PyPDF2 import PdfReader
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import fitz  # PyMuPDF
 from langchain.text_splitter import RecursiveCharacterTextSplitter
+from utility.chunker import TokenChunker, get_token_chunker
 from langchain_google_genai import GoogleGenerativeAIEmbeddings, ChatGoogleGenerativeAI
 from langchain_community.vectorstores import FAISS
+from langchain_community.vectorstores.utils import DistanceStrategy
+from langchain.docstore.in_memory import InMemoryDocstore
+from langchain.schema import Document
+import faiss
+import numpy as np
 from langchain.chains.question_answering import load_qa_chain
 from langchain.prompts import PromptTemplate
 from dotenv import load_dotenv
 import google.generativeai as genai
+import hashlib
 import os
+import pickle
+import sqlite3
+import time
 import uuid
 import json
 # Import document generator without causing circular import
@@ -19,53 +30,201 @@ genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
 
 # ======================== PDF & Text Functions ========================
 
+# Splitter init compiles its separator regexes; build it once at import
+# instead of per call (it holds no per-document state).
+_FALLBACK_SPLITTER = RecursiveCharacterTextSplitter(chunk_size=10000, chunk_overlap=1000)
+
+def _extract_pdf_text(pdf):
+    """Extracts one uploaded PDF's text with PyMuPDF (C-backed, joins once)."""
+    doc = fitz.open(stream=pdf.read(), filetype="pdf")
+    return "\n".join(page.get_text() for page in doc)
+
 def get_pdf_text(pdf_docs):
     """Extracts and concatenates text from a list of uploaded PDFs."""
-    text = ""
-    for pdf in pdf_docs:
-        pdf_reader = PdfReader(pdf)
-        for page in pdf_reader.pages:
-            text += page.extract_text() or ""
-    return text
+    if len(pdf_docs) == 1:
+        return _extract_pdf_text(pdf_docs[0])
+    # Each decode is independent and PyMuPDF releases the GIL in its C code,
+    # so per-file threads make wall time ≈ the slowest PDF instead of the sum.
+    with ThreadPoolExecutor(max_workers=min(8, len(pdf_docs))) as executor:
+        texts = list(executor.map(_extract_pdf_text, pdf_docs))
+    return "\n".join(texts)
 
+@st.cache_data(show_spinner=False)
 def get_text_chunks(text):
-    """Splits long text into smaller overlapping chunks."""
-    text_splitter = RecursiveCharacterTextSplitter(chunk_size=10000, chunk_overlap=1000)
-    return text_splitter.split_text(text)
+    """Splits long text into smaller overlapping chunks (cached per text)."""
+    if TokenChunker is not None:
+        # Tokenizer-aware chunking (Rust-backed) — much faster than the
+        # recursive splitter and boundaries align with model tokens.
+        return [chunk.text for chunk in get_token_chunker()(text)]
+    return _FALLBACK_SPLITTER.split_text(text)
+
+# ======================== Cached Clients ========================
+
+@st.cache_resource
+def get_embeddings():
+    """One embeddings client per process — avoids re-auth and session setup per call."""
+    return GoogleGenerativeAIEmbeddings(model="models/embedding-001")
 
 # ======================== Vector Store Functions ========================
 
+# Chunks per embed_documents request — O(N/BATCH) round trips instead of the
+# per-chunk calls FAISS.from_texts can degrade to.
+EMBED_BATCH_SIZE = 64
+
+def _embed_in_batches(embeddings, text_chunks):
+    """Embeds chunks in batched requests; each batch retries independently."""
+    vectors = []
+    for start in range(0, len(text_chunks), EMBED_BATCH_SIZE):
+        batch = text_chunks[start:start + EMBED_BATCH_SIZE]
+        max_retries = 3
+        retry_delay = 2  # seconds
+        for attempt in range(max_retries):
+            try:
+                vectors.extend(embeddings.embed_documents(batch))
+                break
+            except Exception as e:
+                if attempt < max_retries - 1:
+                    print(f"Embedding batch attempt {attempt+1} failed: {str(e)}. Retrying in {retry_delay} seconds...")
+                    time.sleep(retry_delay)
+                    retry_delay *= 2  # Exponential backoff
+                else:
+                    print(f"Failed to embed batch after {max_retries} attempts: {str(e)}")
+                    raise
+    return vectors
+
+# Content-hash → folder_id map, so resubmitting an already-processed corpus
+# skips the embedding calls (the expensive, paid step) entirely.
+_HASH_INDEX_PATH = os.path.join("faiss_index", "_hash_index.json")
+
+def _load_hash_index():
+    try:
+        with open(_HASH_INDEX_PATH, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _record_hash(content_hash, folder_id):
+    index = _load_hash_index()
+    index[content_hash] = folder_id
+    with open(_HASH_INDEX_PATH, "w") as f:
+        json.dump(index, f)
+
+# HNSW build/search parameters: 32 neighbors per node, efConstruction=200 for
+# build quality, efSearch=64 at query time — near-flat recall with graph-based
+# sub-linear search instead of IndexFlatL2's brute-force O(N*d) scan per query.
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+
+def _build_hnsw_store(embeddings, text_chunks, vectors):
+    """Wraps chunks + precomputed vectors in a langchain FAISS store over HNSW."""
+    vecs = np.asarray(vectors, dtype='float32')
+    # Cosine retrieval as inner product over unit vectors: normalization is
+    # paid once at build, and each comparison is a SIMD dot product with no
+    # per-candidate square root.
+    faiss.normalize_L2(vecs)
+    index = faiss.IndexHNSWFlat(vecs.shape[1], HNSW_M, faiss.METRIC_INNER_PRODUCT)
+    index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+    index.hnsw.efSearch = HNSW_EF_SEARCH
+    index.add(vecs)
+    docstore = InMemoryDocstore({
+        str(i): Document(page_content=chunk) for i, chunk in enumerate(text_chunks)
+    })
+    return FAISS(
+        embedding_function=embeddings,
+        index=index,
+        docstore=docstore,
+        index_to_docstore_id={i: str(i) for i in range(len(text_chunks))},
+        distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT,
+        normalize_L2=True,  # query vectors get the same one-time normalization
+    )
+
 def save_vector_store(text_chunks, doc_name):
     """Creates and saves FAISS vector store with metadata."""
+    content_hash = hashlib.sha256("\x00".join(text_chunks).encode()).hexdigest()
+    existing = _load_hash_index().get(content_hash)
+    if existing and os.path.isdir(os.path.join("faiss_index", existing)):
+        print(f"Corpus already processed as '{existing}'; skipping re-embedding.")
+        return existing
+
     folder_id = f"{doc_name}_{uuid.uuid4().hex[:6]}"
     folder_path = os.path.join("faiss_index", folder_id)
     os.makedirs(folder_path, exist_ok=True)
 
-    # Add retry logic for embedding creation
-    max_retries = 3
-    retry_delay = 2  # seconds
-    
-    for attempt in range(max_retries):
-        try:
-            embeddings = GoogleGenerativeAIEmbeddings(model="models/embedding-001")
-            vector_store = FAISS.from_texts(text_chunks, embedding=embeddings)
-            vector_store.save_local(folder_path)
-            
-            metadata = {"doc_name": doc_name, "folder": folder_id}
-            with open(os.path.join(folder_path, "metadata.json"), "w") as f:
-                json.dump(metadata, f)
-                
-            return folder_id
-        
-        except Exception as e:
-            if attempt < max_retries - 1:
-                import time
-                print(f"Embedding attempt {attempt+1} failed: {str(e)}. Retrying in {retry_delay} seconds...")
-                time.sleep(retry_delay)
-                retry_delay *= 2  # Exponential backoff
-            else:
-                print(f"Failed to create embeddings after {max_retries} attempts: {str(e)}")
-                raise
+    embeddings = get_embeddings()
+    vectors = _embed_in_batches(embeddings, text_chunks)
+    vector_store = _build_hnsw_store(embeddings, text_chunks, vectors)
+    vector_store.save_local(folder_path)
+
+    metadata = {"doc_name": doc_name, "folder": folder_id}
+    with open(os.path.join(folder_path, "metadata.json"), "w") as f:
+        json.dump(metadata, f)
+
+    _record_hash(content_hash, folder_id)
+    _record_doc_index(folder_id, doc_name)
+    return folder_id
+
+# Memory-map index.faiss on load so concurrent Streamlit sessions share pages
+# through the OS cache instead of each holding a private copy in RSS. Trades a
+# touch of cold-start I/O for lower steady-state memory; FAISS_MMAP=0 forces
+# the regular in-memory load.
+_MMAP_INDEX = os.getenv("FAISS_MMAP", "1") != "0"
+
+def _load_store_mmap(folder_path, embeddings):
+    """Rebuilds a langchain FAISS store around a memory-mapped native index.
+
+    Does by hand what FAISS.load_local does, except the index file is opened
+    read-only via mmap rather than read fully into memory. Raises if the index
+    type doesn't support mmap; the caller falls back to the regular load.
+    """
+    index = faiss.read_index(
+        os.path.join(folder_path, "index.faiss"),
+        faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY,
+    )
+    with open(os.path.join(folder_path, "index.pkl"), "rb") as f:
+        docstore, index_to_id = pickle.load(f)
+    kwargs = {}
+    if index.metric_type == faiss.METRIC_INNER_PRODUCT:
+        # Stores built by _build_hnsw_store hold unit vectors under IP.
+        kwargs = {
+            "distance_strategy": DistanceStrategy.MAX_INNER_PRODUCT,
+            "normalize_L2": True,
+        }
+    return FAISS(
+        embedding_function=embeddings,
+        index=index,
+        docstore=docstore,
+        index_to_docstore_id=index_to_id,
+        **kwargs,
+    )
+
+def _tune_search_params(vector_store):
+    """Applies the current query-time scan breadth to a loaded index.
+
+    efSearch is serialized with the index, so stores built before a parameter
+    change would otherwise keep their old (possibly default, 16) value forever.
+    Setting it on load keeps recall consistent across old and new stores; flat
+    legacy indexes have no such knob and pass through untouched.
+    """
+    hnsw = getattr(vector_store.index, "hnsw", None)
+    if hnsw is not None:
+        hnsw.efSearch = HNSW_EF_SEARCH
+    return vector_store
+
+def _maybe_to_gpu(vector_store):
+    """Moves the search index to the GPU when a CUDA device is available.
+
+    Indexes stay on disk in CPU form; only the loaded copy is transferred, so
+    stores remain portable across machines with and without GPUs. faiss-cpu
+    wheels ship no GPU symbols, in which case this is a no-op.
+    """
+    try:
+        if faiss.get_num_gpus() > 0:
+            resources = faiss.StandardGpuResources()
+            vector_store.index = faiss.index_cpu_to_gpu(resources, 0, vector_store.index)
+    except AttributeError:
+        pass
+    return vector_store
 
 @st.cache_resource
 def load_vector_store(folder_name):
@@ -73,11 +232,19 @@ def load_vector_store(folder_name):
     # Add retry logic for loading vector store
     max_retries = 3
     retry_delay = 2  # seconds
-    
+
     for attempt in range(max_retries):
         try:
-            embeddings = GoogleGenerativeAIEmbeddings(model="models/embedding-001")
-            return FAISS.load_local(os.path.join("faiss_index", folder_name), embeddings, allow_dangerous_deserialization=True)
+            embeddings = get_embeddings()
+            folder_path = os.path.join("faiss_index", folder_name)
+            if _MMAP_INDEX:
+                try:
+                    vector_store = _load_store_mmap(folder_path, embeddings)
+                    return _maybe_to_gpu(_tune_search_params(vector_store))
+                except Exception as e:
+                    print(f"mmap load failed ({e}); falling back to in-memory load.")
+            vector_store = FAISS.load_local(folder_path, embeddings, allow_dangerous_deserialization=True)
+            return _maybe_to_gpu(_tune_search_params(vector_store))
         except Exception as e:
             if attempt < max_retries - 1:
                 import time
@@ -88,8 +255,25 @@ def load_vector_store(folder_name):
                 print(f"Failed to load vector store after {max_retries} attempts: {str(e)}")
                 raise
 
-def list_processed_documents():
-    """Lists available processed documents with their metadata."""
+# Consolidated folder_id → doc_name index so listing is one file read instead
+# of an os.listdir plus a metadata.json open per folder on every rerun.
+_DOC_INDEX_PATH = os.path.join("faiss_index", "_index.json")
+
+def _record_doc_index(folder_id, doc_name):
+    try:
+        with open(_DOC_INDEX_PATH, "r") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}
+    index[folder_id] = doc_name
+    # Write-then-rename keeps the index readable if a save is interrupted.
+    tmp_path = _DOC_INDEX_PATH + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(index, f)
+    os.replace(tmp_path, _DOC_INDEX_PATH)
+
+def _scan_legacy_documents():
+    """Per-folder metadata.json scan, kept for stores saved before _index.json."""
     base_path = "faiss_index"
     if not os.path.exists(base_path):
         return []
@@ -103,10 +287,47 @@ def list_processed_documents():
                 docs.append((metadata["doc_name"], name))
     return docs
 
+# chatbot.py records its saves in a SQLite registry over the same faiss_index/
+# directory; the listing merges both so documents processed in either tab show up.
+_REGISTRY_DB_PATH = os.path.join("faiss_index", "registry.sqlite")
+
+def _registry_documents():
+    """(doc_name, folder_id) pairs from chatbot.py's SQLite registry, if present."""
+    if not os.path.exists(_REGISTRY_DB_PATH):
+        return []
+    try:
+        conn = sqlite3.connect(_REGISTRY_DB_PATH)
+        rows = conn.execute(
+            "SELECT doc_name, folder_id FROM docs ORDER BY created_at DESC"
+        ).fetchall()
+        conn.close()
+        return [(doc_name, folder_id) for doc_name, folder_id in rows]
+    except sqlite3.Error as e:
+        print(f"Could not read document registry: {e}")
+        return []
+
+@st.cache_data(ttl=60, show_spinner=False)
+def list_processed_documents():
+    """Lists available processed documents with their metadata."""
+    docs = []
+    seen = set()
+    try:
+        with open(_DOC_INDEX_PATH, "r") as f:
+            index = json.load(f)
+        docs = [(doc_name, folder_id) for folder_id, doc_name in index.items()]
+        seen = set(index)
+    except (OSError, ValueError):
+        pass
+    docs += [(d, f) for d, f in _registry_documents() if f not in seen]
+    if docs:
+        return docs
+    return _scan_legacy_documents()
+
 # ======================== QA Chain Setup ========================
 
+@st.cache_resource
 def get_conversational_chain():
-    """Initializes the prompt + LLM chain for QA."""
+    """Initializes the prompt + LLM chain for QA (built once per process)."""
     prompt_template = """
     Answer the question as detailed as possible from the provided context. If the answer is not in
     the provided context, just say "Answer is not available in the context." Do not make up answers.
@@ -122,17 +343,20 @@ def get_conversational_chain():
     prompt = PromptTemplate(template=prompt_template, input_variables=["context", "question"])
     return load_qa_chain(model, chain_type="stuff", prompt=prompt)
 
-def answer_question(user_question, folder_name):
-    """Fetches relevant docs and returns model-generated answer."""
+def _answer_with(vector_store, chain, user_question):
+    """Runs one search + completion against an already-loaded store and chain.
+
+    Only the transient steps (similarity search and the Gemini call) sit in
+    the retry loop; the store and chain are resolved once by the caller
+    instead of on every attempt.
+    """
     # Add retry logic for answering questions
     max_retries = 3
     retry_delay = 2  # seconds
-    
+
     for attempt in range(max_retries):
         try:
-            vector_store = load_vector_store(folder_name)
             docs = vector_store.similarity_search(user_question)
-            chain = get_conversational_chain()
             response = chain({"input_documents": docs, "question": user_question}, return_only_outputs=True)
             return response["output_text"]
         except Exception as e:
@@ -145,6 +369,18 @@ def answer_question(user_question, folder_name):
                 print(f"Failed to answer question after {max_retries} attempts: {str(e)}")
                 raise
 
+@st.cache_data(ttl=3600, show_spinner=False)
+def answer_question(user_question, folder_name):
+    """Fetches relevant docs and returns model-generated answer.
+
+    Results are cached per (question, folder) for an hour — repeated chat
+    questions and the five canned generation queries skip both the FAISS
+    search and the Gemini call, which also softens rate-limit pressure.
+    """
+    vector_store = load_vector_store(folder_name)
+    chain = get_conversational_chain()
+    return _answer_with(vector_store, chain, user_question)
+
 # ======================== Document Generation Helper ========================
 
 def get_rag_content(folder_name):
@@ -164,26 +400,28 @@ def get_rag_content(folder_name):
         'quality_control': "What quality control measures does the company have?"
     }
     
-    # Get answers for each query
-    for key, question in queries.items():
-        try:
-            # Add a timeout limit to prevent hanging
-            import time
-            start_time = time.time()
-            max_timeout = 30  # 30 seconds max per query
-            
-            answer = answer_question(question, folder_name)
-            
-            # If we get a valid answer, add it to the content
-            if answer and "not available in the context" not in answer:
-                rag_content[key] = answer
-                
-        except Exception as e:
-            # Log the error but continue with other queries
-            print(f"Error getting RAG content for '{key}': {str(e)}")
-            # Don't let one failure stop the document generation
-            continue
-    
+    # The five queries are independent network calls (similarity search +
+    # Gemini completion), so run them concurrently — total latency becomes the
+    # slowest query instead of the sum. The cached vector store and QA chain
+    # are shared safely across threads.
+    with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+        futures = {
+            executor.submit(answer_question, question, folder_name): key
+            for key, question in queries.items()
+        }
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                answer = future.result()
+                # If we get a valid answer, add it to the content
+                if answer and "not available in the context" not in answer:
+                    rag_content[key] = answer
+            except Exception as e:
+                # Log the error but continue with other queries — don't let one
+                # failure stop the document generation
+                print(f"Error getting RAG content for '{key}': {str(e)}")
+
+
     # If we couldn't get any RAG content, at least provide empty content
     if not rag_content:
         print("Warning: Could not retrieve any RAG content. Using fallback content.")
@@ -222,9 +460,14 @@ def main():
                     chunks = get_text_chunks(text)
                     name = os.path.splitext(pdf_docs[0].name)[0].replace(" ", "_")
                     save_vector_store(chunks, name)
+                    list_processed_documents.clear()
                     st.success(f"'{name}' processed and saved!")
                     st.rerun()  # 🔁 Trigger rerun to update dropdown
 
+        if st.button("Clear answer cache"):
+            answer_question.clear()
+            st.success("Cached answers cleared!")
+
     # Chat Tab Content
     with chat_tab:
         st.subheader("💬 Ask a Question")
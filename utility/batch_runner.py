@@ -0,0 +1,55 @@
+import json
+import os
+import tempfile
+import time
+
+from google import genai as google_genai
+
+POLL_INTERVAL_SECONDS = 10
+_TERMINAL_STATES = {"JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"}
+
+
+def run_batch(prompts: dict, model="gemini-2.0-flash", poll_interval=POLL_INTERVAL_SECONDS) -> dict:
+    """
+    Run {key: prompt_text} through the Gemini Batch API as one JSONL job
+    (50% cheaper than synchronous calls, minutes of latency) and return
+    {key: response_text}. Keys with no usable response map to "".
+    """
+    client = google_genai.Client()
+
+    with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as f:
+        for key, prompt in prompts.items():
+            f.write(json.dumps({
+                "key": key,
+                "request": {"contents": [{"parts": [{"text": prompt}]}]},
+            }) + "\n")
+        jsonl_path = f.name
+
+    try:
+        src_file = client.files.upload(
+            file=jsonl_path,
+            config={"display_name": "rfp-analyzer-batch", "mime_type": "jsonl"},
+        )
+    finally:
+        # The JSONL only exists to be uploaded; don't leak one per batch run.
+        os.unlink(jsonl_path)
+    batch_job = client.batches.create(model=model, src=src_file.name)
+
+    while batch_job.state.name not in _TERMINAL_STATES:
+        time.sleep(poll_interval)
+        batch_job = client.batches.get(name=batch_job.name)
+
+    if batch_job.state.name != "JOB_STATE_SUCCEEDED":
+        raise RuntimeError(f"Batch job ended in state {batch_job.state.name}: {batch_job.error}")
+
+    results = {}
+    result_bytes = client.files.download(file=batch_job.dest.file_name)
+    for line in result_bytes.decode("utf-8").splitlines():
+        entry = json.loads(line)
+        key = entry.get("key")
+        try:
+            parts = entry["response"]["candidates"][0]["content"]["parts"]
+            results[key] = "".join(p.get("text", "") for p in parts).strip()
+        except (KeyError, IndexError, TypeError):
+            results[key] = ""
+    return results
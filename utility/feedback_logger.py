@@ -1,10 +1,92 @@
+import atexit
 import json
+import queue
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+import threading
 from datetime import datetime
 from pathlib import Path
 
 FEEDBACK_LOG = Path("logs/feedback_log.jsonl")
 FEEDBACK_LOG.parent.mkdir(parents=True, exist_ok=True)
 
+USAGE_LOG = Path("logs/usage_log.jsonl")
+
+# Log writes go through a background queue so button callbacks never block on
+# disk I/O; a daemon thread drains entries of (path, line).
+_queue = queue.Queue()
+
+# One line-buffered append handle per log file, opened on first use — a single
+# write syscall per entry instead of an open/write/close triple.
+_handles = {}
+
+
+def _handle(path):
+    fh = _handles.get(path)
+    if fh is None:
+        fh = open(path, "a", buffering=1)
+        _handles[path] = fh
+    return fh
+
+
+@atexit.register
+def _close_handles():
+    for fh in _handles.values():
+        try:
+            fh.close()
+        except Exception:
+            pass
+
+
+def _dumps_line(entry):
+    """One JSONL line — orjson's C serializer when installed, stdlib otherwise."""
+    if orjson is not None:
+        return orjson.dumps(entry).decode() + "\n"
+    return json.dumps(entry) + "\n"
+
+
+def _drain():
+    while True:
+        path, line = _queue.get()
+        try:
+            _handle(path).write(line)
+        except Exception as e:
+            print(f"Log write failed: {e}")
+        finally:
+            _queue.task_done()
+
+
+_writer = threading.Thread(target=_drain, daemon=True)
+_writer.start()
+
+# Rolling per-process totals so the UI can show cache hit rate without re-reading the log.
+_usage_totals = {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0, "output_tokens": 0}
+
+
+def log_usage(agent_name, result):
+    """Record one Gemini call's token usage (cache hit rate = cached/prompt over time)."""
+    _usage_totals["calls"] += 1
+    _usage_totals["prompt_tokens"] += result.prompt_tokens
+    _usage_totals["cached_tokens"] += result.cached_tokens
+    _usage_totals["output_tokens"] += result.output_tokens
+    entry = {
+        "timestamp": datetime.utcnow().isoformat(),
+        "agent": agent_name,
+        "prompt_tokens": result.prompt_tokens,
+        "cached_tokens": result.cached_tokens,
+        "output_tokens": result.output_tokens,
+        "latency_ms": round(result.latency_ms, 1),
+    }
+    _queue.put_nowait((USAGE_LOG, _dumps_line(entry)))
+
+
+def usage_stats():
+    """Snapshot of this process's accumulated Gemini usage totals."""
+    return dict(_usage_totals)
+
 def log_feedback(rfp_name, agent_name, output_text, rating, comment=""):
     entry = {
         "timestamp": datetime.utcnow().isoformat(),
@@ -14,5 +96,4 @@ def log_feedback(rfp_name, agent_name, output_text, rating, comment=""):
         "rating": rating,  # "👍" or "👎"
         "comment": comment
     }
-    with open(FEEDBACK_LOG, "a") as f:
-        f.write(json.dumps(entry) + "\n")
+    _queue.put_nowait((FEEDBACK_LOG, _dumps_line(entry)))
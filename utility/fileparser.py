@@ -1,42 +1,119 @@
 import json
+import multiprocessing
+import os
+import zipfile
 import fitz  # PyMuPDF
+from lxml import etree
+
+try:
+    import orjson
+except ImportError:
+    # Optional: Rust-backed JSON decoding; stdlib json remains the fallback.
+    orjson = None
 import docx
+from functools import lru_cache
 from pathlib import Path
 from typing import Union
 
 
+@lru_cache(maxsize=4)
+def _load_json_cached(file_path: str, mtime: float) -> dict:
+    if orjson is not None:
+        with open(file_path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(file_path, 'r') as f:
+        return json.load(f)
+
+
 def load_json(file_path: Union[str, Path]) -> dict:
     """
     Load and return JSON data from a file.
+    Cached per (path, mtime) so repeated loads of an unchanged file are free.
     """
-    with open(file_path, 'r') as f:
-        return json.load(f)
+    path = str(file_path)
+    return _load_json_cached(path, os.path.getmtime(path))
+
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
 
 
-def parse_docx(file_path: Union[str, Path]) -> str:
+def _parse_docx_xml(source) -> str:
+    """Pull paragraph text straight out of word/document.xml.
+
+    A .docx is a zip; reading the body XML and joining the w:t runs of each
+    top-level w:p skips building the python-docx object model, which is the
+    bulk of extraction time on documents with thousands of paragraphs.
     """
-    Parse and return text content from a DOCX file.
+    with zipfile.ZipFile(source) as zf:
+        xml = zf.read("word/document.xml")
+    body = etree.fromstring(xml).find(_W + "body")
+    parts = []
+    for para in body.iterfind(_W + "p"):
+        text = "".join(t.text for t in para.iter(_W + "t") if t.text).strip()
+        if text:
+            parts.append(text)
+    return "\n".join(parts)
+
+
+def parse_docx(source) -> str:
     """
-    doc = docx.Document(file_path)
-    return "\n".join([para.text.strip() for para in doc.paragraphs if para.text.strip()])
+    Parse and return text content from a DOCX file path or file-like object.
+    """
+    try:
+        return _parse_docx_xml(source)
+    except Exception as e:
+        print(f"Direct XML extraction failed ({e}); falling back to python-docx.")
+        if hasattr(source, "seek"):
+            source.seek(0)
+        doc = docx.Document(source)
+        return "\n".join(text for para in doc.paragraphs if (text := para.text.strip()))
+
 
+# Page count above which per-page extraction is fanned out across processes.
+_LARGE_PDF_PAGES = 50
 
-def parse_pdf(file_path: Union[str, Path]) -> str:
+
+def _page_text(args):
+    """Extract one page's text in a worker (PDF bytes + page index are picklable)."""
+    pdf_bytes, page_number = args
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return doc[page_number].get_text("text")
+
+
+def parse_pdf(source) -> str:
     """
-    Extract and return text from a PDF file using PyMuPDF.
+    Extract and return text from a PDF (path or file-like object) using PyMuPDF.
+    Large documents are split across a small process pool; extraction is
+    CPU-bound so the fan-out scales with cores.
     """
-    doc = fitz.open(file_path)
-    return "\n".join([page.get_text() for page in doc])
+    if hasattr(source, "read"):
+        pdf_bytes = source.read()
+    else:
+        with open(source, "rb") as f:
+            pdf_bytes = f.read()
+    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    if doc.page_count > _LARGE_PDF_PAGES:
+        with multiprocessing.Pool(4) as pool:
+            pages = pool.map(
+                _page_text,
+                [(pdf_bytes, i) for i in range(doc.page_count)],
+                chunksize=8,
+            )
+        return "\n".join(pages)
+    return "\n".join(page.get_text("text") for page in doc)
 
 
-def parse_file(file_path: Union[str, Path]) -> str:
+def parse_file(source, file_name: Union[str, Path, None] = None) -> str:
     """
     Detect and parse DOCX or PDF based on file extension.
+    Accepts a path or an in-memory file-like object (pass file_name so the
+    extension can be detected); parsing from memory skips the temp-file write.
     """
-    ext = Path(file_path).suffix.lower()
+    name = file_name or getattr(source, "name", None) or source
+    ext = Path(name).suffix.lower()
     if ext == ".docx":
-        return parse_docx(file_path)
+        return parse_docx(source)
     elif ext == ".pdf":
-        return parse_pdf(file_path)
+        return parse_pdf(source)
     else:
         raise ValueError(f"Unsupported file format: {ext}")
@@ -0,0 +1,45 @@
+import asyncio
+
+import google.generativeai as genai
+
+# Documents shorter than this pass through untouched (~8k tokens).
+CONDENSE_THRESHOLD_CHARS = 32000
+CHUNK_CHARS = 12000
+LITE_MODEL = "gemini-2.0-flash-lite"
+
+_CONDENSE_PROMPT = (
+    "Condense the following RFP excerpt to at most 500 tokens. Keep every "
+    "requirement, deadline, format instruction and eligibility condition; "
+    "drop boilerplate.\n\n{chunk}"
+)
+
+
+async def _condense_chunk(model, chunk):
+    try:
+        response = await model.generate_content_async(
+            _CONDENSE_PROMPT.format(chunk=chunk),
+            generation_config={"temperature": 0},
+        )
+        return response.text.strip()
+    except Exception as e:
+        print(f"Condense chunk failed ({e}); keeping original text.")
+        return chunk
+
+
+async def condense(chunks, model_name=LITE_MODEL):
+    """Summarize chunks concurrently with the lite model and join the results."""
+    model = genai.GenerativeModel(model_name)
+    summaries = await asyncio.gather(*(_condense_chunk(model, chunk) for chunk in chunks))
+    return "\n\n".join(summaries)
+
+
+def condense_document(full_doc, threshold_chars=CONDENSE_THRESHOLD_CHARS):
+    """
+    Map-reduce condensation: long documents are sliced, each slice summarized
+    in parallel by gemini-2.0-flash-lite, and the ~500-token summaries joined.
+    Short documents are returned as-is.
+    """
+    if len(full_doc) <= threshold_chars:
+        return full_doc
+    chunks = [full_doc[i:i + CHUNK_CHARS] for i in range(0, len(full_doc), CHUNK_CHARS)]
+    return asyncio.run(condense(chunks))
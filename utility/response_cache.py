@@ -0,0 +1,22 @@
+import hashlib
+
+import diskcache
+
+CACHE_DIR = "./.rfp_cache"
+DEFAULT_TTL_SECONDS = 86400
+
+_cache = diskcache.Cache(CACHE_DIR)
+
+
+def make_key(agent_id: str, template_src: str, full_doc: str, extra: str = "") -> str:
+    """Stable cache key: same agent + same prompt template + same document ⇒ same response."""
+    payload = f"{agent_id}\x00{template_src}\x00{full_doc}\x00{extra}"
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def get(key):
+    return _cache.get(key)
+
+
+def set(key, value, expire=DEFAULT_TTL_SECONDS):
+    _cache.set(key, value, expire=expire)